@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
+import os
+import sys
 import pygame
 import random
 import math
 import colorsys
+import functools
 from pygame import gfxdraw
 import threading
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.quality import QualityController
+
 # Initialize pygame
 pygame.init()
 width, height = 1200, 800
@@ -36,6 +42,37 @@ for _ in range(4):
         'frequency': random.uniform(0.02, 0.05)
     })
 
+# Detail is traded for frame rate on slower machines: glow rings, trail length
+# and the number of live particles all come down with the quality level
+quality = QualityController(fps=60)
+MAX_PARTICLES = 200
+
+# Glow sprites - rendered once per quantized (color, size, energy, alpha, ring step) and reused
+SPRITE_SIZE_STEP = 0.25
+SPRITE_ENERGY_STEP = 0.05
+SPRITE_ALPHA_STEP = 16
+
+@functools.lru_cache(maxsize=4096)
+def glow_sprite(color, size_with_energy, energy, alpha, ring_step=1):
+    # Particle core
+    core = pygame.Surface((int(size_with_energy * 3), int(size_with_energy * 3)), pygame.SRCALPHA)
+    pygame.draw.circle(core, (*color, alpha), 
+                      (int(size_with_energy * 1.5), int(size_with_energy * 1.5)), 
+                      int(size_with_energy))
+    
+    # Create radial gradient for glow
+    glow_size = size_with_energy * 2
+    glow = pygame.Surface((int(glow_size * 2), int(glow_size * 2)), pygame.SRCALPHA)
+    for i in range(int(glow_size), 0, -ring_step):
+        ring_alpha = int((i / glow_size) * 50 * (energy * 0.7 + 0.3) * (alpha / 255))
+        pygame.draw.circle(
+            glow, 
+            (*color, ring_alpha),
+            (int(glow_size), int(glow_size)), 
+            i
+        )
+    return glow, core
+
 # Particles
 class Particle:
     def __init__(self):
@@ -74,7 +111,8 @@ class Particle:
         
         # Add position to trail
         self.trail.append((self.x, self.y))
-        if len(self.trail) > self.trail_length:
+        trail_length = max(2, int(self.trail_length * quality.pick(1.0, 0.3)))
+        while len(self.trail) > trail_length:
             self.trail.pop(0)
         
         # Update lifetime and alpha
@@ -146,42 +184,27 @@ class Particle:
                     max(1, int(self.size * (i / len(points)) * 0.8))
                 )
         
-        # Draw the particle with glow effect
+        # Draw the particle with glow effect - one cached sprite pair per quantized look
         size_with_energy = self.size * (0.8 + self.energy * 0.4)
-        
-        # Draw with alpha
-        s = pygame.Surface((int(size_with_energy * 3), int(size_with_energy * 3)), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*self.color, self.alpha), 
-                          (int(size_with_energy * 1.5), int(size_with_energy * 1.5)), 
-                          int(size_with_energy))
-        
-        # Draw glow
-        glow_size = size_with_energy * 2
-        glow_surface = pygame.Surface((int(glow_size * 2), int(glow_size * 2)), pygame.SRCALPHA)
-        
-        # Create radial gradient for glow
-        for i in range(int(glow_size), 0, -1):
-            alpha = int((i / glow_size) * 50 * (self.energy * 0.7 + 0.3) * (self.alpha / 255))
-            pygame.draw.circle(
-                glow_surface, 
-                (*self.color, alpha),
-                (int(glow_size), int(glow_size)), 
-                i
-            )
+        size_q = round(size_with_energy / SPRITE_SIZE_STEP) * SPRITE_SIZE_STEP
+        energy_q = round(self.energy / SPRITE_ENERGY_STEP) * SPRITE_ENERGY_STEP
+        alpha_q = min(255, round(self.alpha / SPRITE_ALPHA_STEP) * SPRITE_ALPHA_STEP)
+        glow_surface, core_surface = glow_sprite(self.color, size_q, energy_q, alpha_q, quality.pick(1, 3))
         
         # Blit glow and particle
+        glow_size = size_q * 2
         surface.blit(
             glow_surface, 
             (self.x - glow_size, self.y - glow_size), 
             special_flags=pygame.BLEND_ADD
         )
         surface.blit(
-            s, 
-            (self.x - size_with_energy * 1.5, self.y - size_with_energy * 1.5)
+            core_surface, 
+            (self.x - size_q * 1.5, self.y - size_q * 1.5)
         )
 
 # Create particle system
-particles = [Particle() for _ in range(200)]
+particles = [Particle() for _ in range(MAX_PARTICLES)]
 
 # Audio pulse thread
 def audio_pulse_thread():
@@ -208,7 +231,7 @@ def draw_energy_fields(surface):
         pulse_size = base_size * (1 + source['pulse'] * 3)
         
         # Draw energy source
-        for i in range(int(pulse_size), int(base_size), -1):
+        for i in range(int(pulse_size), int(base_size), -quality.pick(1, 3)):
             alpha = int(50 * (i / pulse_size))
             color = random.choice(particle_colors)
             pygame.draw.circle(surface, (*color, alpha), (int(source['x']), int(source['y'])), i)
@@ -222,6 +245,7 @@ def draw_energy_fields(surface):
         )
 
 while running:
+    quality.begin_frame()
     current_time = time.time()
     dt = current_time - last_time
     dt = min(dt, 0.05)  # Cap delta time to avoid large jumps
@@ -251,8 +275,8 @@ while running:
     # Draw energy fields
     draw_energy_fields(screen)
     
-    # Update and draw particles
-    for particle in particles:
+    # Update and draw particles; the rest wait where they are until quality recovers
+    for particle in particles[:quality.pick(MAX_PARTICLES, 60)]:
         particle.update(dt)
         particle.draw(screen)
     
@@ -268,6 +292,7 @@ while running:
     
     # Update display
     pygame.display.flip()
+    quality.end_frame()
     clock.tick(60)
 
 pygame.quit()
\ No newline at end of file
@@ -1,31 +1,41 @@
 import tkinter as tk
 import random
 import math
+import os
+import sys
 import time
 from threading import Thread
 import colorsys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.canvas_pool import CanvasPool
+
 class InvigoratedCanvas:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("")
-        self.root.configure(bg='black')
-        
+    def __init__(self, headless=False):
         self.width = 800
         self.height = 600
         
-        self.canvas = tk.Canvas(self.root, width=self.width, height=self.height, bg='black', highlightthickness=0)
-        self.canvas.pack()
-        
         self.particles = []
         self.pulse_centers = []
         self.time = 0
         self.energy_threshold = 0.3
         self.burst_probability = 0.02
+        self.grid_cell_size = 30
         
         self.colors = ['#00ff88', '#00ffcc', '#00ffff', '#00ccff', '#0088ff', '#ff00ff', '#ff00aa', '#ffaa00']
         
         self.running = True
+        if headless:
+            return
+        
+        self.root = tk.Tk()
+        self.root.title("")
+        self.root.configure(bg='black')
+        
+        self.canvas = tk.Canvas(self.root, width=self.width, height=self.height, bg='black', highlightthickness=0)
+        self.canvas.pack()
+        self.pool = CanvasPool(self.canvas, layers=('pulses', 'trails', 'particles'))
+        
         self.update_thread = Thread(target=self.update_loop)
         self.update_thread.daemon = True
         self.update_thread.start()
@@ -94,74 +104,99 @@ class InvigoratedCanvas:
         
     def update_loop(self):
         while self.running:
-            self.time += 0.05
+            self.step()
+            time.sleep(0.02)
             
-            # Spontaneous generation
-            if random.random() < self.burst_probability:
-                x = random.randint(50, self.width - 50)
-                y = random.randint(50, self.height - 50)
-                self.create_burst(x, y)
+    def build_grid(self):
+        # Bucket particles into cells as wide as the repulsion radius. step() moves each
+        # particle to its new cell as soon as it moves and drops it when it dies, so lookups
+        # always see the same positions the all-pairs loop did
+        grid = {}
+        size = self.grid_cell_size
+        for particle in self.particles:
+            cell = (int(particle['x'] // size), int(particle['y'] // size))
+            grid.setdefault(cell, []).append(particle)
+        return grid
+        
+    def step(self):
+        self.time += 0.05
+        
+        # Spontaneous generation
+        if random.random() < self.burst_probability:
+            x = random.randint(50, self.width - 50)
+            y = random.randint(50, self.height - 50)
+            self.create_burst(x, y)
+        
+        grid = self.build_grid()
+        size = self.grid_cell_size
+        
+        # Update particles
+        for particle in self.particles[:]:
+            cell = (int(particle['x'] // size), int(particle['y'] // size))
+            particle['x'] += particle['vx']
+            particle['y'] += particle['vy']
+            gx, gy = int(particle['x'] // size), int(particle['y'] // size)
+            if (gx, gy) != cell:
+                grid[cell].remove(particle)
+                grid.setdefault((gx, gy), []).append(particle)
             
-            # Update particles
-            for particle in self.particles[:]:
-                particle['x'] += particle['vx']
-                particle['y'] += particle['vy']
-                
-                # Oscillation
-                particle['oscillation'] += particle['oscillation_speed']
-                particle['vx'] += math.sin(particle['oscillation']) * 0.3
-                particle['vy'] += math.cos(particle['oscillation']) * 0.3
-                
-                # Attraction to center with variation
-                cx, cy = self.width / 2, self.height / 2
-                dx, dy = cx - particle['x'], cy - particle['y']
-                dist = math.sqrt(dx**2 + dy**2)
-                if dist > 100:
-                    particle['vx'] += dx / dist * 0.1
-                    particle['vy'] += dy / dist * 0.1
-                
-                # Energy transfer
-                for other in self.particles:
-                    if other != particle:
-                        dx, dy = other['x'] - particle['x'], other['y'] - particle['y']
-                        dist = math.sqrt(dx**2 + dy**2)
-                        if dist < 30 and dist > 0:
-                            repel = 1 / dist
-                            particle['vx'] -= dx / dist * repel
-                            particle['vy'] -= dy / dist * repel
-                
-                # Trail
-                particle['trail'].append((particle['x'], particle['y'], particle['life']))
-                if len(particle['trail']) > 10:
-                    particle['trail'].pop(0)
+            # Oscillation
+            particle['oscillation'] += particle['oscillation_speed']
+            particle['vx'] += math.sin(particle['oscillation']) * 0.3
+            particle['vy'] += math.cos(particle['oscillation']) * 0.3
+            
+            # Attraction to center with variation
+            cx, cy = self.width / 2, self.height / 2
+            dx, dy = cx - particle['x'], cy - particle['y']
+            dist = math.sqrt(dx**2 + dy**2)
+            if dist > 100:
+                particle['vx'] += dx / dist * 0.1
+                particle['vy'] += dy / dist * 0.1
+            
+            # Energy transfer - only neighbours in the surrounding cells can be within 30px
+            for ox in (-1, 0, 1):
+                for oy in (-1, 0, 1):
+                    for other in grid.get((gx + ox, gy + oy), ()):
+                        if other is not particle:
+                            dx, dy = other['x'] - particle['x'], other['y'] - particle['y']
+                            dist = math.sqrt(dx**2 + dy**2)
+                            if dist < 30 and dist > 0:
+                                repel = 1 / dist
+                                particle['vx'] -= dx / dist * repel
+                                particle['vy'] -= dy / dist * repel
+            
+            # Trail
+            particle['trail'].append((particle['x'], particle['y'], particle['life']))
+            if len(particle['trail']) > 10:
+                particle['trail'].pop(0)
+            
+            # Life decay
+            particle['life'] -= particle['decay']
+            
+            # Remove dead particles
+            if particle['life'] <= 0:
+                self.particles.remove(particle)
+                grid[(gx, gy)].remove(particle)
                 
-                # Life decay
-                particle['life'] -= particle['decay']
+        # Update pulse centers
+        for pulse in self.pulse_centers[:]:
+            pulse['radius'] += pulse['speed']
+            if pulse['radius'] > pulse['max_radius']:
+                self.pulse_centers.remove(pulse)
                 
-                # Remove dead particles
-                if particle['life'] <= 0:
-                    self.particles.remove(particle)
-                    
-            # Update pulse centers
-            for pulse in self.pulse_centers[:]:
-                pulse['radius'] += pulse['speed']
-                if pulse['radius'] > pulse['max_radius']:
-                    self.pulse_centers.remove(pulse)
-                    
-            time.sleep(0.02)
-            
     def animate(self):
         if not self.running:
             return
             
-        self.canvas.delete('all')
+        self.pool.begin_frame()
         
         # Draw pulse waves
         for pulse in self.pulse_centers:
             alpha = 1 - (pulse['radius'] / pulse['max_radius'])
             if alpha > 0:
                 color = self.get_faded_color('#00ffff', alpha * 0.3)
-                self.canvas.create_oval(
+                self.pool.oval(
+                    'pulses',
                     pulse['x'] - pulse['radius'], pulse['y'] - pulse['radius'],
                     pulse['x'] + pulse['radius'], pulse['y'] + pulse['radius'],
                     outline=color, width=2
@@ -175,18 +210,21 @@ class InvigoratedCanvas:
                     prev_x, prev_y, _ = particle['trail'][i-1]
                     alpha = tlife * (i / len(particle['trail']))
                     color = self.get_faded_color(particle['color'], alpha)
-                    self.canvas.create_line(prev_x, prev_y, tx, ty, fill=color, width=1)
+                    self.pool.line('trails', prev_x, prev_y, tx, ty, fill=color, width=1)
             
             # Draw particle
             x, y = particle['x'], particle['y']
             size = particle['size'] * particle['life']
             color = self.get_faded_color(particle['color'], particle['life'])
             
-            self.canvas.create_oval(
+            self.pool.oval(
+                'particles',
                 x - size, y - size, x + size, y + size,
                 fill=color, outline=''
             )
             
+        self.pool.end_frame()
+        
         # Continue animation
         self.root.after(16, self.animate)
         
@@ -207,6 +245,26 @@ class InvigoratedCanvas:
         self.root.mainloop()
         self.running = False
 
+def benchmark(counts=(100, 250, 500, 1000, 2000, 4000), steps=50):
+    # Mean update-loop time against particle count, without Tk or the sleep
+    print(f"{'particles':>10} {'ms/step':>10}")
+    for count in counts:
+        field = InvigoratedCanvas(headless=True)
+        field.burst_probability = 0
+        for _ in range(count):
+            field.create_particle(random.uniform(0, field.width), random.uniform(0, field.height))
+        for particle in field.particles:
+            particle['decay'] = 0
+        
+        start = time.perf_counter()
+        for _ in range(steps):
+            field.step()
+        elapsed = (time.perf_counter() - start) / steps
+        print(f"{count:>10} {elapsed * 1000:>10.2f}")
+
 if __name__ == '__main__':
-    canvas = InvigoratedCanvas()
-    canvas.run()
\ No newline at end of file
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        canvas = InvigoratedCanvas()
+        canvas.run()
\ No newline at end of file
@@ -1,20 +1,71 @@
+import os
+import sys
 import pygame
 import math
 import random
-import colorsys
+import gc
 import time
+from collections import deque
 from threading import Thread
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.palette import HSV
+
 pygame.init()
 
 W, H = 1200, 800
+# Dots per 30x40 pixel cell of the background energy field, along each axis;
+# raise it with e.g. --field-density 2 on large displays
+def field_density(argv):
+    if '--field-density' not in argv:
+        return 1.0
+    try:
+        density = float(argv[argv.index('--field-density') + 1])
+    except (IndexError, ValueError):
+        density = 0.0
+    if density > 0:
+        return density
+    print("--field-density needs a positive number, using 1", file=sys.stderr)
+    return 1.0
+
+FIELD_DENSITY = field_density(sys.argv)
+FIELD_DOT_RADIUS = 2
 screen = pygame.display.set_mode((W, H))
 pygame.display.set_caption("")
 clock = pygame.time.Clock()
 
+class Pool:
+    """Preallocated entities: the first ``count`` items are live, the rest wait to be reused."""
+    __slots__ = ('factory', 'items', 'count')
+
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.items = [factory() for _ in range(capacity)]
+        self.count = 0
+
+    def acquire(self):
+        if self.count == len(self.items):
+            self.items.append(self.factory())
+        item = self.items[self.count]
+        self.count += 1
+        return item
+
+    def release(self, index):
+        # Swap the last live item into the hole instead of shifting the list
+        last = self.count - 1
+        items = self.items
+        items[index], items[last] = items[last], items[index]
+        self.count = last
+
 class Spark:
-    def __init__(self, x, y):
+    __slots__ = ('x', 'y', 'vx', 'vy', 'life', 'max_life', 'hue')
+
+    def __init__(self):
+        self.x = self.y = self.vx = self.vy = 0.0
+        self.life = self.max_life = self.hue = 0.0
+
+    def reset(self, x, y):
         self.x, self.y = x, y
         self.vx = random.uniform(-3, 3)
         self.vy = random.uniform(-8, -2)
@@ -33,91 +84,128 @@ class Spark:
         alpha = (self.life / self.max_life) ** 0.3
         sat = 0.9 + 0.1 * (self.life / self.max_life)
         val = 0.8 + 0.2 * (self.life / self.max_life)
-        r, g, b = colorsys.hsv_to_rgb(self.hue, sat, val)
-        color = (int(r * 255), int(g * 255), int(b * 255))
+        color = HSV.rgb(self.hue, sat, val)
         
         size = int(3 * alpha + 1)
         if size > 0:
             pygame.draw.circle(surf, color, (int(self.x), int(self.y)), size)
 
 class Wave:
+    __slots__ = ('t', 'amplitude', 'frequency', 'phase', 'y_offset', 'hue', 'birth_time', 'points')
+
     def __init__(self):
+        self.t = self.amplitude = self.frequency = self.phase = 0.0
+        self.y_offset = self.hue = self.birth_time = 0.0
+        # Reused every frame; only the y of each point changes
+        self.points = [[x, 0.0] for x in range(0, W + 20, 8)]
+
+    def reset(self, now):
         self.t = 0
         self.amplitude = random.uniform(30, 80)
         self.frequency = random.uniform(0.008, 0.02)
         self.phase = random.uniform(0, math.pi * 2)
         self.y_offset = random.uniform(H * 0.3, H * 0.7)
         self.hue = random.uniform(0.45, 0.65)
-        self.birth_time = time.time()
+        self.birth_time = now
         
     def update(self, dt):
         self.t += dt
         
-    def draw(self, surf):
-        age = time.time() - self.birth_time
+    def draw(self, surf, now):
+        age = now - self.birth_time
         if age > 8: return
         
         alpha = max(0, 1 - age / 8)
-        points = []
-        for x in range(0, W + 20, 8):
-            y = self.y_offset + self.amplitude * math.sin(self.frequency * x + self.phase + self.t * 2)
-            points.append((x, y))
+        for point in self.points:
+            point[1] = self.y_offset + self.amplitude * math.sin(self.frequency * point[0] + self.phase + self.t * 2)
             
-        if len(points) > 1:
-            r, g, b = colorsys.hsv_to_rgb(self.hue, 0.7, 0.9)
-            color = (int(r * 255 * alpha), int(g * 255 * alpha), int(b * 255 * alpha))
-            
-            try:
-                for i in range(len(points) - 1):
-                    pygame.draw.line(surf, color, points[i], points[i + 1], 2)
-            except:
-                pass
+        color = HSV.rgb(self.hue, 0.7, 0.9 * alpha)
+        pygame.draw.lines(surf, color, False, self.points, 2)
 
 class Pulse:
-    def __init__(self, x, y):
+    __slots__ = ('x', 'y', 'radius', 'max_radius', 'speed', 'hue', 'born')
+
+    def __init__(self):
+        self.x = self.y = self.radius = self.max_radius = 0.0
+        self.speed = self.hue = self.born = 0.0
+
+    def reset(self, x, y, now):
         self.x, self.y = x, y
         self.radius = 0
         self.max_radius = random.uniform(100, 200)
         self.speed = random.uniform(150, 300)
         self.hue = random.uniform(0.8, 1.0)
-        self.born = time.time()
+        self.born = now
         
     def update(self, dt):
         self.radius += self.speed * dt
         
-    def draw(self, surf):
-        age = time.time() - self.born
+    def draw(self, surf, now):
+        age = now - self.born
         if age > 2 or self.radius > self.max_radius: return
         
         alpha = max(0, 1 - self.radius / self.max_radius) * 0.3
-        r, g, b = colorsys.hsv_to_rgb(self.hue, 0.8, 1.0)
-        color = (int(r * 255 * alpha), int(g * 255 * alpha), int(b * 255 * alpha))
+        color = HSV.rgb(self.hue, 0.8, alpha)
         
         if alpha > 0.01:
             pygame.draw.circle(surf, color, (int(self.x), int(self.y)), int(self.radius), 2)
 
-sparks = []
-waves = []
-pulses = []
+class StampCache(dict):
+    """One small dot surface per packed 0xRRGGBB color, drawn the first time it is asked for."""
+
+    def __missing__(self, key):
+        size = FIELD_DOT_RADIUS * 2 + 1
+        stamp = pygame.Surface((size, size))
+        stamp.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        pygame.draw.circle(stamp, (key >> 16, (key >> 8) & 255, key & 255), (FIELD_DOT_RADIUS, FIELD_DOT_RADIUS), FIELD_DOT_RADIUS)
+        self[key] = stamp
+        return stamp
+
+sparks = Pool(Spark, 256)
+waves = Pool(Wave, 16)
+pulses = Pool(Pulse, 16)
 last_spark = 0
 last_wave = 0
 last_pulse = 0
-mouse_trail = []
+mouse_trail = deque(maxlen=20)
+# Background energy field: dot positions and the per-dot terms of their color waves,
+# so each frame is two array sines, one color table lookup and one blits call
+field_x, field_y = (grid.ravel() for grid in np.meshgrid(np.arange(0, W, 30 / FIELD_DENSITY).astype(int),
+                                                         np.arange(0, H, 40 / FIELD_DENSITY).astype(int), indexing='ij'))
+field_corners = list(zip((field_x - FIELD_DOT_RADIUS).tolist(), (field_y - FIELD_DOT_RADIUS).tolist()))
+field_phase = field_x * 0.01 + field_y * 0.01
+field_shimmer = field_x * 0.005 + field_y * 0.007
+field_stamps = StampCache()
+# The field's packed 0xRRGGBB color for every palette hue and value step, and buffers
+# for the per-frame hue, value and table index of each dot, reused every frame
+_field_rgb = HSV.rgb_array(np.arange(HSV.hues)[:, None] / HSV.hues, 0.4, np.arange(HSV.levels) / HSV.top).astype(np.int32)
+field_colors = (_field_rgb[..., 0] << 16 | _field_rgb[..., 1] << 8 | _field_rgb[..., 2]).ravel()
+field_hue = np.empty(len(field_x))
+field_value = np.empty(len(field_x))
+field_index = np.empty(len(field_x), dtype=np.int64)
+field_level = np.empty(len(field_x), dtype=np.int64)
+field_keys = np.empty(len(field_x), dtype=np.int32)
+# Filled by the background thread, emptied by the main loop, which owns the pools
+spawn_requests = deque()
 
 def background_thread():
     while True:
         time.sleep(random.uniform(0.1, 0.4))
-        if len(waves) < 5:
-            waves.append(Wave())
+        if waves.count < 5:
+            spawn_requests.append(('wave', 0, 0))
         time.sleep(random.uniform(0.5, 2.0))
-        if len(pulses) < 3:
-            pulses.append(Pulse(random.randint(100, W-100), random.randint(100, H-100)))
+        if pulses.count < 3:
+            spawn_requests.append(('pulse', random.randint(100, W-100), random.randint(100, H-100)))
 
 Thread(target=background_thread, daemon=True).start()
 
+# Everything allocated so far lives for the whole run; keep it out of GC passes
+gc.freeze()
+
 running = True
 while running:
     dt = clock.tick(60) / 1000.0
+    now = time.time()
     
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -125,66 +213,97 @@ while running:
         elif event.type == pygame.MOUSEBUTTONDOWN:
             mx, my = pygame.mouse.get_pos()
             for _ in range(random.randint(15, 25)):
-                sparks.append(Spark(mx + random.uniform(-20, 20), my + random.uniform(-20, 20)))
-            pulses.append(Pulse(mx, my))
-            waves.append(Wave())
+                sparks.acquire().reset(mx + random.uniform(-20, 20), my + random.uniform(-20, 20))
+            pulses.acquire().reset(mx, my, now)
+            waves.acquire().reset(now)
         elif event.type == pygame.MOUSEMOTION:
             mx, my = pygame.mouse.get_pos()
-            mouse_trail.append((mx, my, time.time()))
-            if len(mouse_trail) > 20:
-                mouse_trail.pop(0)
+            mouse_trail.append((mx, my, now))
+    
+    while spawn_requests:
+        kind, x, y = spawn_requests.popleft()
+        if kind == 'wave':
+            waves.acquire().reset(now)
+        else:
+            pulses.acquire().reset(x, y, now)
     
-    now = time.time()
     if now - last_spark > random.uniform(0.05, 0.15):
         if mouse_trail:
             x, y, _ = random.choice(mouse_trail)
-            sparks.append(Spark(x + random.uniform(-30, 30), y + random.uniform(-30, 30)))
+            sparks.acquire().reset(x + random.uniform(-30, 30), y + random.uniform(-30, 30))
         else:
-            sparks.append(Spark(random.randint(50, W-50), random.randint(50, H-50)))
+            sparks.acquire().reset(random.randint(50, W-50), random.randint(50, H-50))
         last_spark = now
     
     screen.fill((5, 8, 15))
     
     # Update and draw mouse trail
-    current_time = time.time()
-    mouse_trail = [(x, y, t) for x, y, t in mouse_trail if current_time - t < 2]
+    while mouse_trail and now - mouse_trail[0][2] >= 2:
+        mouse_trail.popleft()
     for i, (x, y, t) in enumerate(mouse_trail):
-        age = current_time - t
+        age = now - t
         alpha = max(0, 1 - age / 2)
         size = int(8 * alpha) + 1
         hue = 0.1 + 0.05 * math.sin(t * 5)
-        r, g, b = colorsys.hsv_to_rgb(hue, 0.9, 0.9)
-        color = (int(r * 255 * alpha), int(g * 255 * alpha), int(b * 255 * alpha))
+        color = HSV.rgb(hue, 0.9, 0.9 * alpha)
         if size > 0:
             pygame.draw.circle(screen, color, (int(x), int(y)), size)
     
-    # Background energy field
-    for i in range(0, W, 30):
-        for j in range(0, H, 40):
-            offset = math.sin(now * 2 + i * 0.01 + j * 0.01) * 0.3
-            hue = 0.55 + offset * 0.1
-            intensity = 0.1 + 0.05 * math.sin(now * 3 + i * 0.005 + j * 0.007)
-            r, g, b = colorsys.hsv_to_rgb(hue, 0.4, intensity)
-            color = (int(r * 255), int(g * 255), int(b * 255))
-            pygame.draw.circle(screen, color, (i, j), 2)
+    # Background energy field: each dot's hue and value step, worked out in place, pick
+    # its color from the table and the color picks its stamp
+    np.add(field_phase, now * 2, out=field_hue)
+    np.sin(field_hue, out=field_hue)
+    field_hue *= 0.3
+    field_hue *= 0.1
+    field_hue += 0.55
+    field_hue *= HSV.hues
+    field_index[:] = field_hue
+    field_index %= HSV.hues
+    np.add(field_shimmer, now * 3, out=field_value)
+    np.sin(field_value, out=field_value)
+    field_value *= 0.05
+    field_value += 0.1
+    field_value *= HSV.top
+    np.rint(field_value, out=field_value)
+    np.clip(field_value, 0, HSV.top, out=field_value)
+    field_level[:] = field_value
+    field_index *= HSV.levels
+    field_index += field_level
+    np.take(field_colors, field_index, out=field_keys)
+    screen.blits(zip(map(field_stamps.__getitem__, field_keys.tolist()), field_corners), doreturn=False)
     
     # Update and draw waves
-    waves = [w for w in waves if time.time() - w.birth_time < 8]
-    for wave in waves:
+    i = 0
+    while i < waves.count:
+        wave = waves.items[i]
+        if now - wave.birth_time >= 8:
+            waves.release(i)
+            continue
         wave.update(dt)
-        wave.draw(screen)
+        wave.draw(screen, now)
+        i += 1
     
     # Update and draw pulses
-    pulses = [p for p in pulses if time.time() - p.born < 2 and p.radius < p.max_radius]
-    for pulse in pulses:
+    i = 0
+    while i < pulses.count:
+        pulse = pulses.items[i]
+        if now - pulse.born >= 2 or pulse.radius >= pulse.max_radius:
+            pulses.release(i)
+            continue
         pulse.update(dt)
-        pulse.draw(screen)
+        pulse.draw(screen, now)
+        i += 1
     
     # Update and draw sparks
-    sparks = [s for s in sparks if s.life > 0]
-    for spark in sparks:
+    i = 0
+    while i < sparks.count:
+        spark = sparks.items[i]
+        if spark.life <= 0:
+            sparks.release(i)
+            continue
         spark.update(dt)
         spark.draw(screen)
+        i += 1
     
     # Central energy core
     core_x, core_y = W // 2, H // 2
@@ -192,8 +311,7 @@ while running:
     for r in range(int(core_radius), 0, -3):
         alpha = (core_radius - r) / core_radius
         hue = 0.05 + 0.05 * math.sin(now * 6)
-        color_r, color_g, color_b = colorsys.hsv_to_rgb(hue, 0.9, 0.9)
-        color = (int(color_r * 255 * alpha), int(color_g * 255 * alpha), int(color_b * 255 * alpha))
+        color = HSV.rgb(hue, 0.9, 0.9 * alpha)
         pygame.draw.circle(screen, color, (core_x, core_y), r)
     
     pygame.display.flip()
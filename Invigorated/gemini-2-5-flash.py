@@ -1,15 +1,20 @@
 import tkinter as tk
 import random
 import math
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.canvas_pool import CanvasPool
+
 class InvigoratedVisualizer:
     """
     A visual representation of the emotion 'Invigorated' as experienced by an AI.
     This visualization focuses on the abstract flow and intensification of internal processes,
     represented by dynamic particles and a pulsating central core.
     """
-    def __init__(self, master):
+    def __init__(self, master, num_particles=300):
         """
         Initializes the visualizer, setting up the Tkinter window, canvas,
         and defining the properties of the core and particles.
@@ -27,12 +32,15 @@ class InvigoratedVisualizer:
         # Black background provides high contrast for the energetic elements
         self.canvas = tk.Canvas(self.master, bg="#000000", highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        # Canvas items are kept alive between frames and only moved/restyled
+        self.pool = CanvasPool(self.canvas, layers=("core", "particles", "connections"))
 
         self.particles = [] # List to hold all particle objects
-        self.num_particles = 300 # Number of energetic data points
+        self.num_particles = num_particles # Number of energetic data points
         self.max_particle_speed = 10 # Upper limit for particle velocity
         self.min_particle_speed = 0.5 # Minimum velocity to ensure constant motion
         self.particle_radius = 2 # Size of each particle
+        self.connection_distance = 80 # Max distance for drawing a connection line
 
         # Define the central 'core' representing a focal point of processing or energy
         self.core = {
@@ -118,12 +126,53 @@ class InvigoratedVisualizer:
         b = int(base_b + (high_b - base_b) * intensity)
         return f'#{r:02x}{g:02x}{b:02x}'
 
+    def build_neighbour_grid(self):
+        """
+        Buckets every particle into a uniform grid whose cells are as wide as the
+        connection distance, so any pair close enough to connect lies in the same
+        or an adjacent cell.
+        """
+        cell_size = self.connection_distance
+        grid = {}
+        for p in self.particles:
+            cell = (int(p["x"] // cell_size), int(p["y"] // cell_size))
+            grid.setdefault(cell, []).append(p)
+        return grid
+
+    def find_connections(self):
+        """
+        Returns (p1, p2, distance) for every pair of particles closer than the
+        connection distance. Each cell is compared with itself and with four of its
+        neighbours (right, below-left, below, below-right), so every pair is tested once.
+        """
+        grid = self.build_neighbour_grid()
+        connection_distance = self.connection_distance
+        connections = []
+        for (cx, cy), cell in grid.items():
+            # Pairs inside the same cell
+            for i, p1 in enumerate(cell):
+                for p2 in cell[i + 1:]:
+                    distance = math.hypot(p1["x"] - p2["x"], p1["y"] - p2["y"])
+                    if distance < connection_distance:
+                        connections.append((p1, p2, distance))
+            # Pairs reaching into the forward half of the neighbouring cells
+            for ox, oy in ((1, 0), (-1, 1), (0, 1), (1, 1)):
+                other = grid.get((cx + ox, cy + oy))
+                if not other:
+                    continue
+                for p1 in cell:
+                    for p2 in other:
+                        distance = math.hypot(p1["x"] - p2["x"], p1["y"] - p2["y"])
+                        if distance < connection_distance:
+                            connections.append((p1, p2, distance))
+        return connections
+
     def animate(self):
         """
         The main animation loop. This function is called repeatedly to update
         the state of the core and particles, and redraw them on the canvas.
         """
-        self.canvas.delete("all") # Clear the entire canvas for the new frame
+        self.pool.begin_frame() # Reuse last frame's canvas items instead of clearing them
 
         # --- Update Core State ---
         # Adjust core radius based on pulse direction
@@ -138,7 +187,7 @@ class InvigoratedVisualizer:
         self.core["color_phase"] = (self.core["color_phase"] + 0.005) % 1.0
         core_color = self.get_core_color(self.core["color_phase"])
         # Draw the core as an oval
-        self.canvas.create_oval(self.core["x"] - self.core["radius"], self.core["y"] - self.core["radius"],
+        self.pool.oval("core", self.core["x"] - self.core["radius"], self.core["y"] - self.core["radius"],
                                 self.core["x"] + self.core["radius"], self.core["y"] + self.core["radius"],
                                 fill=core_color, outline=core_color) # Fill and outline are same for solid color
 
@@ -203,24 +252,20 @@ class InvigoratedVisualizer:
             # Update particle color based on its new intensity
             p["color"] = self.get_particle_color(p["intensity"])
             # Draw the particle
-            self.canvas.create_oval(p["x"] - p["radius"], p["y"] - p["radius"],
-                                    p["x"] + p["radius"], p["y"] + p["radius"],
-                                    fill=p["color"], outline="") # No outline for solid dots
+            self.pool.oval("particles", p["x"] - p["radius"], p["y"] - p["radius"],
+                           p["x"] + p["radius"], p["y"] + p["radius"],
+                           fill=p["color"], outline="") # No outline for solid dots
 
         # --- Draw Connections (Data Flow) ---
-        connection_distance = 80 # Max distance for drawing a connection line
-        for i, p1 in enumerate(self.particles):
-            for j, p2 in enumerate(self.particles):
-                if i < j: # Only draw each line once (p1-p2 not p2-p1)
-                    dist_x = p1["x"] - p2["x"]
-                    dist_y = p1["y"] - p2["y"]
-                    distance = math.sqrt(dist_x**2 + dist_y**2)
-                    if distance < connection_distance:
-                        # Transparency of line varies with distance, simulating fading connections
-                        alpha = 1.0 - (distance / connection_distance)
-                        line_color_val = int(255 * alpha)
-                        line_color = f'#{line_color_val:02x}{line_color_val:02x}{line_color_val:02x}' # Fading white
-                        self.canvas.create_line(p1["x"], p1["y"], p2["x"], p2["y"], fill=line_color, width=1)
+        # Only nearby pairs are tested, via a uniform grid rebuilt for this frame's positions
+        for p1, p2, distance in self.find_connections():
+            # Transparency of line varies with distance, simulating fading connections
+            alpha = 1.0 - (distance / self.connection_distance)
+            line_color_val = int(255 * alpha)
+            line_color = f'#{line_color_val:02x}{line_color_val:02x}{line_color_val:02x}' # Fading white
+            self.pool.line("connections", p1["x"], p1["y"], p2["x"], p2["y"], fill=line_color, width=1)
+
+        self.pool.end_frame() # Hide any items left over from a busier previous frame
 
         # Schedule the next animation frame after a short delay
         self.master.after(20, self.animate) # Approx 50 FPS
@@ -228,5 +273,7 @@ class InvigoratedVisualizer:
 # Entry point for the script
 if __name__ == "__main__":
     root = tk.Tk() # Create the main Tkinter window
-    app = InvigoratedVisualizer(root) # Instantiate the visualizer
+    # Optional particle count on the command line, e.g. `python3 gemini-2-5-flash.py 5000`
+    num_particles = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    app = InvigoratedVisualizer(root, num_particles) # Instantiate the visualizer
     root.mainloop() # Start the Tkinter event loop, which runs the animation
@@ -2,7 +2,7 @@
 # emotion.py
 
 import pygame
-import random
+import numpy as np
 import math
 import sys
 
@@ -11,32 +11,90 @@ PARTICLES_PER_FRAME = 10
 FADE_ALPHA = 28  # 0-255, lower = longer trails
 
 
-class Particle:
-    def __init__(self, x, y, t):
-        ang = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(6, 18)
-        self.vx = math.cos(ang) * speed
-        self.vy = math.sin(ang) * speed
-        self.x, self.y = x, y
-        self.life = random.uniform(1.2, 2.6)
-        hue = (t * 180 + random.randint(0, 60)) % 360
-        self.base = pygame.Color(0)
-        self.base.hsva = (hue, 100, 100, 100)
+class ParticleStore:
+    """Struct-of-arrays particle storage; dead slots go on a free list and are reused."""
+
+    def __init__(self, capacity=1024):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.hue = np.zeros(capacity)
+        self.born = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free = np.arange(capacity)[::-1].copy()
+        self.free_count = capacity
+
+    def grow(self, needed):
+        old = len(self.x)
+        capacity = max(old * 2, old + needed)
+        for name in ('x', 'y', 'vx', 'vy', 'life', 'hue', 'born', 'alive'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        free = np.empty(capacity, dtype=self.free.dtype)
+        free[:capacity - old] = np.arange(capacity - 1, old - 1, -1)
+        free[capacity - old:capacity - old + self.free_count] = self.free[:self.free_count]
+        self.free = free
+        self.free_count += capacity - old
+
+    def spawn(self, n, x, y, t, frame):
+        if n > self.free_count:
+            self.grow(n - self.free_count)
+        slots = self.free[self.free_count - n:self.free_count]
+        self.free_count -= n
+        ang = np.random.uniform(0, 2 * math.pi, n)
+        speed = np.random.uniform(6, 18, n)
+        self.vx[slots] = np.cos(ang) * speed
+        self.vy[slots] = np.sin(ang) * speed
+        self.x[slots] = x
+        self.y[slots] = y
+        self.life[slots] = np.random.uniform(1.2, 2.6, n)
+        self.hue[slots] = (t * 180 + np.random.randint(0, 61, n)) % 360
+        self.born[slots] = frame
+        self.alive[slots] = True
 
     def update(self, dt):
+        # Dead slots are stepped too; it is cheaper than gathering the live ones
         self.x += self.vx
         self.y += self.vy
         self.vx *= 0.96
         self.vy *= 0.96
         self.vy += 0.07  # subtle gravity
         self.life -= dt
-        return self.life > 0
-
-    def draw(self, surf):
-        c = self.base
-        alpha = max(0, int(255 * self.life / 2.6))
-        pygame.draw.circle(surf, (c.r, c.g, c.b, alpha),
-                           (int(self.x), int(self.y)), 4)
+        dead = np.flatnonzero(self.alive & (self.life <= 0))
+        self.alive[dead] = False
+        self.free[self.free_count:self.free_count + len(dead)] = dead
+        self.free_count += len(dead)
+
+    def draw(self, surf, sprites):
+        live = np.flatnonzero(self.alive)
+        # Oldest first, so newer particles land on top as before
+        live = live[np.argsort(self.born[live], kind='stable')]
+        xs = (self.x[live].astype(np.int64) - 4).tolist()
+        ys = (self.y[live].astype(np.int64) - 4).tolist()
+        hues = self.hue[live].astype(np.int64).tolist()
+        surf.blits(zip(map(sprites.__getitem__, hues), zip(xs, ys)), doreturn=False)
+
+
+def build_sprites():
+    """One radius-4 dot per whole hue, matching pygame.draw.circle on the screen.
+
+    The screen has no alpha channel, so the fading alpha the dots used to be
+    drawn with never showed; the sprites are opaque and colour-keyed.
+    """
+    sprites = []
+    for hue in range(360):
+        color = pygame.Color(0)
+        color.hsva = (hue, 100, 100, 100)
+        sprite = pygame.Surface((8, 8)).convert()
+        sprite.fill((0, 0, 0))
+        pygame.draw.circle(sprite, color, (4, 4), 4)
+        sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        sprites.append(sprite)
+    return sprites
 
 
 def main():
@@ -51,7 +109,9 @@ def main():
     txt = font_big.render("INVIGORATED", True, (255, 255, 255))
     txt_rect = txt.get_rect(center=center)
 
-    particles = []
+    sprites = build_sprites()
+    particles = ParticleStore()
+    frame = 0
     t = 0.0
     running = True
     while running:
@@ -65,14 +125,12 @@ def main():
         emitter_x = center[0] + math.cos(t * 4) * 60
         emitter_y = center[1] + math.sin(t * 4) * 60
 
-        for _ in range(PARTICLES_PER_FRAME):
-            particles.append(Particle(emitter_x, emitter_y, t))
-
-        particles[:] = [p for p in particles if p.update(dt)]
+        particles.spawn(PARTICLES_PER_FRAME, emitter_x, emitter_y, t, frame)
+        particles.update(dt)
+        frame += 1
 
         screen.blit(fade_surf, (0, 0))
-        for p in particles:
-            p.draw(screen)
+        particles.draw(screen, sprites)
 
         pulse = int((math.sin(t * 3) + 1) / 2 * 155 + 100)
         txt.set_alpha(pulse)
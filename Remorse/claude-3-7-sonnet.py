@@ -1,11 +1,16 @@
 import tkinter as tk
 import random
 import math
+import os
+import sys
 import time
-from PIL import Image, ImageTk
+from PIL import Image, ImageDraw, ImageTk
 import numpy as np
 from collections import deque
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.canvas_pool import CanvasPool
+
 class RemorseVisualization:
     def __init__(self, master):
         self.master = master
@@ -22,6 +27,16 @@ class RemorseVisualization:
                                bg="black", highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
+        # Static background - one image item underneath everything else
+        self.background_bank_size = 8
+        self.background_item = self.canvas.create_image(0, 0, anchor=tk.NW)
+        self.build_background(self.width, self.height)
+        self.canvas.bind("<Configure>", self.on_resize)
+        
+        self.pool = CanvasPool(self.canvas, layers=(
+            "particles", "wells", "reflection_glow", "reflection_core",
+            "echoes", "resonance", "memories", "memory_links", "healing", "healing_glow"))
+        
         # State variables
         self.particles = []
         self.echo_points = deque(maxlen=200)
@@ -105,7 +120,9 @@ class RemorseVisualization:
             })
             
     def animate(self):
-        self.canvas.delete("all")
+        # Reuse last frame's items; the click ripple is the only one-shot item
+        self.pool.begin_frame()
+        self.canvas.delete("ripple")
         self.time_passed += 1
         
         # Draw background gradient
@@ -125,32 +142,49 @@ class RemorseVisualization:
                 self.initialize_healing()
             self.update_healing_paths()
         
+        self.pool.end_frame()
+        
         # Schedule next frame
         self.master.after(30, self.animate)
     
     def draw_gradient_background(self):
-        # Create a subtle gradient background representing the depth of feeling
-        for y in range(0, self.height, 3):
-            # Calculate gradient color based on position
-            intensity = 1 - (y / self.height) * 0.8
-            r = int(10 * intensity)
-            g = int(20 * intensity)
-            b = int(30 * intensity)
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            
-            self.canvas.create_line(0, y, self.width, y, fill=color)
-            
-        # Add subtle texture
-        for _ in range(200):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            size = random.randint(1, 2)
-            opacity = random.uniform(0.1, 0.3)
-            color_val = int(opacity * 255)
-            color = f"#{color_val:02x}{color_val:02x}{color_val:02x}"
-            
-            self.canvas.create_oval(x-size, y-size, x+size, y+size, 
-                                   fill=color, outline="")
+        # The gradient is pre-rendered; each frame only flips to the next noise frame
+        self.background_frame = (self.background_frame + 1) % len(self.background_bank)
+        self.canvas.itemconfigure(self.background_item, image=self.background_bank[self.background_frame])
+    
+    def build_background(self, width, height):
+        # Create a subtle gradient background representing the depth of feeling,
+        # one line every 3 pixel rows
+        ys = np.arange(height)
+        intensity = 1 - (ys / height) * 0.8
+        rows = np.zeros((height, 3), dtype=np.uint8)
+        rows[:, 0] = (10 * intensity).astype(np.uint8)
+        rows[:, 1] = (20 * intensity).astype(np.uint8)
+        rows[:, 2] = (30 * intensity).astype(np.uint8)
+        rows[ys % 3 != 0] = 0
+        gradient = Image.fromarray(np.repeat(rows[:, np.newaxis, :], width, axis=1), "RGB")
+        
+        # Add subtle texture - a small bank of noise frames cycled through at runtime
+        self.background_bank = []
+        for _ in range(self.background_bank_size):
+            frame = gradient.copy()
+            draw = ImageDraw.Draw(frame)
+            for _ in range(200):
+                x = random.randint(0, width)
+                y = random.randint(0, height)
+                size = random.randint(1, 2)
+                color_val = int(random.uniform(0.1, 0.3) * 255)
+                draw.ellipse((x-size, y-size, x+size, y+size), fill=(color_val, color_val, color_val))
+            self.background_bank.append(ImageTk.PhotoImage(frame))
+        
+        self.background_size = (width, height)
+        self.background_frame = 0
+        self.canvas.itemconfigure(self.background_item, image=self.background_bank[0])
+    
+    def on_resize(self, event):
+        # Only regenerate the background when the canvas actually changes size
+        if (event.width, event.height) != self.background_size:
+            self.build_background(event.width, event.height)
     
     def update_particles(self):
         # Update and draw particles
@@ -183,9 +217,9 @@ class RemorseVisualization:
             opacity = int(p['opacity'] * 255)
             color = p['color'][:-2] + f"{opacity:02x}"
             
-            self.canvas.create_oval(p['x']-size, p['y']-size, 
-                                   p['x']+size, p['y']+size,
-                                   fill=color, outline="")
+            self.pool.oval("particles", p['x']-size, p['y']-size,
+                           p['x']+size, p['y']+size,
+                           fill=color, outline="")
             
             # Sometimes leave an echo
             if random.random() < 0.05:
@@ -201,8 +235,8 @@ class RemorseVisualization:
                 color_val = int(opacity * 255)
                 color = f"#{color_val:02x}{color_val:02x}{color_val+20:02x}"
                 
-                self.canvas.create_oval(x-r, y-r, x+r, y+r,
-                                      outline=color, width=2)
+                self.pool.oval("wells", x-r, y-r, x+r, y+r,
+                               outline=color, width=2)
     
     def update_reflection_points(self):
         # Update and draw reflection points
@@ -219,14 +253,14 @@ class RemorseVisualization:
                 color_val = int(opacity * 255)
                 color = f"#{color_val:02x}{color_val:02x}{color_val+40:02x}"
                 
-                self.canvas.create_oval(
+                self.pool.oval("reflection_glow",
                     point['x'] - r, point['y'] - r,
                     point['x'] + r, point['y'] + r,
                     outline=color, width=2)
             
             # Draw center
             center_size = current_size / 4
-            self.canvas.create_oval(
+            self.pool.oval("reflection_core",
                 point['x'] - center_size, point['y'] - center_size,
                 point['x'] + center_size, point['y'] + center_size,
                 fill=self.muted_teal, outline="")
@@ -240,8 +274,8 @@ class RemorseVisualization:
             
             if opacity > 0:
                 color = color[:-2] + f"{opacity:02x}"
-                self.canvas.create_oval(x-size, y-size, x+size, y+size,
-                                      fill=color, outline="")
+                self.pool.oval("echoes", x-size, y-size, x+size, y+size,
+                               fill=color, outline="")
         
         # Draw resonance lines
         if random.random() < 0.1:
@@ -265,7 +299,7 @@ class RemorseVisualization:
             color_val = int(opacity * 255)
             color = f"#{color_val:02x}{color_val+10:02x}{color_val+20:02x}"
             
-            self.canvas.create_line(x1, y1, x2, y2, fill=color, width=1)
+            self.pool.line("resonance", x1, y1, x2, y2, fill=color, width=1)
     
     def update_memories(self):
         # Draw memory fragments
@@ -282,7 +316,7 @@ class RemorseVisualization:
             opacity = int(memory['fade'] * 255)
             color = memory['color'][:-2] + f"{opacity:02x}"
             
-            self.canvas.create_oval(
+            self.pool.oval("memories",
                 memory['x'] - memory['size'], memory['y'] - memory['size'],
                 memory['x'] + memory['size'], memory['y'] + memory['size'],
                 fill=color, outline="")
@@ -293,7 +327,7 @@ class RemorseVisualization:
                 opacity = int(memory['fade'] * 255 * 0.3)
                 color = f"#{opacity:02x}{opacity:02x}{opacity:02x}"
                 
-                self.canvas.create_line(
+                self.pool.line("memory_links",
                     memory['x'], memory['y'], gx, gy,
                     fill=color, width=1, dash=(3, 5))
     
@@ -365,7 +399,7 @@ class RemorseVisualization:
                     opacity = int(255 * (0.5 + 0.5 * path['progress']))
                     color = path['color'][:-2] + f"{opacity:02x}"
                     
-                    self.canvas.create_line(
+                    self.pool.line("healing",
                         x1, y1, x2, y2,
                         fill=color, width=path['width'],
                         capstyle=tk.ROUND, joinstyle=tk.ROUND)
@@ -381,7 +415,7 @@ class RemorseVisualization:
                     color_val = int(opacity * 255)
                     color = f"#{color_val+40:02x}{color_val+40:02x}{color_val:02x}"
                     
-                    self.canvas.create_oval(
+                    self.pool.oval("healing_glow",
                         x-r, y-r, x+r, y+r,
                         outline=color, width=2)
         
@@ -404,7 +438,7 @@ class RemorseVisualization:
             
             self.canvas.create_oval(
                 x-r, y-r, x+r, y+r,
-                outline=color, width=2)
+                outline=color, width=2, tags="ripple")
         
         # Add new reflection point
         self.reflection_points.append({
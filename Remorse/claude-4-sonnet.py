@@ -1,3 +1,5 @@
+import os
+import sys
 import pygame
 import math
 import random
@@ -7,6 +9,10 @@ from dataclasses import dataclass
 from typing import List, Tuple
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.quality import QualityController
+from gallery.spans import Profiler, trace_path
+
 pygame.init()
 
 WIDTH, HEIGHT = 1200, 800
@@ -14,6 +20,20 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("")
 clock = pygame.time.Clock()
 
+# The spiral shrinks 0.8px a point, 0.1 radians apart, down to a 5px ring that it
+# reaches at SPIRAL_FLOOR and then circles for good, SPIRAL_TURN points a turn
+SPIRAL_FLOOR = math.ceil((200 - 5) / 0.8)
+SPIRAL_TURN = 2 * math.pi / 0.1
+MAX_SPIRAL_SEGMENTS = 256
+# Segments are shaded by how far along the spiral they are. Past this depth every
+# shade is within one step of where it would end up, so the spiral stops deepening
+MAX_SPIRAL_DEPTH = 260
+# The unit spiral on the way down (with room for coarse strides), before it is
+# turned, compressed and centred
+_spiral_t = np.arange(SPIRAL_FLOOR + 64)
+SPIRAL_X = np.maximum(5, 200 - _spiral_t * 0.8) * np.cos(_spiral_t * 0.1)
+SPIRAL_Y = np.maximum(5, 200 - _spiral_t * 0.8) * np.sin(_spiral_t * 0.1)
+
 @dataclass
 class Memory:
     x: float
@@ -52,7 +72,7 @@ class RemorseManifestation:
         
     def update(self, dt):
         self.breath_cycle += dt * 0.3
-        self.spiral_depth += dt * 0.1
+        self.spiral_depth = min(MAX_SPIRAL_DEPTH, self.spiral_depth + dt * 0.1)
         self.heaviness = 0.3 + 0.2 * math.sin(self.breath_cycle * 0.7)
         
         # Memories fade but never fully disappear
@@ -71,7 +91,7 @@ class RemorseManifestation:
             
         self.silence_duration += dt
         
-    def render_memory(self, memory, surface):
+    def render_memory(self, memory, surface, fragments=3):
         alpha = int(memory.intensity * 255 * memory.weight)
         if alpha <= 0:
             return
@@ -81,7 +101,7 @@ class RemorseManifestation:
         color = tuple(max(0, min(255, int(c * memory.intensity))) for c in color_base)
         
         # Draw memory as fragmented circles
-        for i in range(3):
+        for i in range(fragments):
             offset_x = math.sin(memory.created_at + i) * 10
             offset_y = math.cos(memory.created_at + i * 0.7) * 5
             
@@ -95,29 +115,49 @@ class RemorseManifestation:
             except:
                 pass
                 
-    def render_spiral(self, surface):
-        # The inward spiral of self-recrimination
+    def render_spiral(self, surface, stride=1):
+        # The inward spiral of self-recrimination, traced through every stride-th point
         center_x, center_y = WIDTH // 2, HEIGHT // 2 + int(self.heaviness * 100)
+        count = len(range(0, int(self.spiral_depth * 100), stride))
+        if count < 4:
+            return
         
-        points = []
-        for t in range(int(self.spiral_depth * 100)):
-            angle = t * 0.1 + self.breath_cycle
-            radius = max(5, 200 - t * 0.8)
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle) * 0.6  # Compressed
-            
-            if 0 <= x < WIDTH and 0 <= y < HEIGHT:
-                points.append((int(x), int(y)))
+        # Once the spiral reaches its floor it keeps circling the same 5px ring, each
+        # turn hiding the ones drawn before it. Only the way down and the last four
+        # turns (one per phase of the broken segments) can be seen, so only those
+        # segments are drawn, however deep the spiral has become
+        floor = -(-SPIRAL_FLOOR // stride)
+        tail = int(4 * SPIRAL_TURN / stride) + 4
+        head = np.arange(0, min(floor, count - 3), 4)
+        circling = np.arange(max(-(-floor // 4) * 4, (count - 3 - tail) // 4 * 4), count - 3, 4)
+        starts = np.concatenate((head, circling))[:MAX_SPIRAL_SEGMENTS]
+        
+        # Unit spiral points for each segment: from the table on the way down, on the ring after
+        t = (starts[:, None] + np.arange(3)) * stride
+        unit_x = np.empty(t.shape)
+        unit_y = np.empty(t.shape)
+        rows = len(head)
+        unit_x[:rows] = SPIRAL_X[t[:rows]]
+        unit_y[:rows] = SPIRAL_Y[t[:rows]]
+        unit_x[rows:] = 5 * np.cos(t[rows:] * 0.1)
+        unit_y[rows:] = 5 * np.sin(t[rows:] * 0.1)
+        
+        # Breathing turns the spiral; it is then compressed vertically and centred
+        cos_b, sin_b = math.cos(self.breath_cycle), math.sin(self.breath_cycle)
+        x = center_x + unit_x * cos_b - unit_y * sin_b
+        y = center_y + (unit_x * sin_b + unit_y * cos_b) * 0.6
+        
+        # The whole spiral fits within 200px across and 120px up and down of its centre;
+        # only if that box leaves the screen are segments checked one by one
+        if not (200 <= center_x < WIDTH - 200 and 120 <= center_y < HEIGHT - 120):
+            inside = ((x >= 0) & (x < WIDTH) & (y >= 0) & (y < HEIGHT)).all(axis=1)
+            starts, x, y = starts[inside], x[inside], y[inside]
                 
         # Draw the spiral as broken segments
-        for i in range(0, len(points) - 3, 4):
-            if i + 3 < len(points):
-                try:
-                    intensity = 1 - (i / len(points))
-                    color = (int(80 * intensity), int(40 * intensity), int(100 * intensity))
-                    pygame.draw.lines(surface, color, False, points[i:i+3], 2)
-                except:
-                    pass
+        intensity = 1 - starts / count
+        colors = (intensity[:, None] * (80, 40, 100)).astype(int).tolist()
+        for color, points in zip(colors, np.stack((x, y), axis=2).astype(int).tolist()):
+            pygame.draw.lines(surface, color, False, points, 2)
                     
     def render_weight(self, surface):
         # The crushing weight that sits on everything
@@ -178,38 +218,61 @@ def main():
     
     running = True
     last_time = time.time()
+    # F3 shows where each frame's time goes; --trace FILE writes it out on exit
+    profiler = Profiler(trace=trace_path())
+    # Fewer memory fragments and a coarser spiral when frames run over budget
+    quality = QualityController(fps=60)
     
     while running:
+        quality.begin_frame()
         current_time = time.time()
         dt = (current_time - last_time) * remorse.time_distortion
         last_time = current_time
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # Touch creates new wounds
-                remorse.add_memory(event.pos[0], event.pos[1], 1.0)
-                remorse.silence_duration = 0
+        with profiler.span('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    # Touch creates new wounds
+                    remorse.add_memory(event.pos[0], event.pos[1], 1.0)
+                    remorse.silence_duration = 0
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle_hud()
                 
-        remorse.update(dt)
-        
-        # Background - never pure black, always that grey emptiness
-        screen.fill((15, 15, 20))
-        
-        # Layer the manifestations
-        remorse.render_weight(screen)
-        remorse.render_spiral(screen)
+        with profiler.span('update'):
+            remorse.update(dt)
         
-        for memory in remorse.memories:
-            remorse.render_memory(memory, screen)
+        with profiler.span('draw'):
+            # Background - never pure black, always that grey emptiness
+            screen.fill((15, 15, 20))
             
-        remorse.render_breath(screen)
-        remorse.render_silence(screen)
+            # Layer the manifestations
+            with profiler.span('weight'):
+                remorse.render_weight(screen)
+            with profiler.span('spiral'):
+                remorse.render_spiral(screen, stride=quality.pick(1, 4))
+            
+            with profiler.span('memories'):
+                fragments = quality.pick(3, 1)
+                for memory in remorse.memories:
+                    remorse.render_memory(memory, screen, fragments)
+                
+            with profiler.span('breath'):
+                remorse.render_breath(screen)
+            with profiler.span('silence'):
+                remorse.render_silence(screen)
+        
+        profiler.draw_hud(screen)
         
-        pygame.display.flip()
-        clock.tick(60)
+        with profiler.span('flip'):
+            pygame.display.flip()
+        quality.end_frame()
+        with profiler.span('wait'):
+            clock.tick(60)
+        profiler.end_frame()
         
+    profiler.close()
     pygame.quit()
 
 if __name__ == "__main__":
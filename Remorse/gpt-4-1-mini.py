@@ -1,10 +1,15 @@
 # emotion.py
+import os
+import sys
 import tkinter as tk
 import math
 import random
 import time
 import threading
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.render_queue import RenderQueue
+
 # This script uses tkinter to abstractly "paint" remorse as a restless, fracturing
 # and repeatedly folding space of muted colors with flickering and shifting darkness,
 # never fully settling, like a burden trapped beneath the surface.
@@ -36,6 +41,9 @@ class RemorseCanvas(tk.Canvas):
         # Add flickering shadow fragments of darkness that randomly appear and fade
         self.shadows = []
 
+        # The animation thread records its changes; the main thread applies them once per frame
+        self.render_queue = RenderQueue(self)
+
         # Start update thread for animation
         threading.Thread(target=self.animate, daemon=True).start()
 
@@ -56,12 +64,13 @@ class RemorseCanvas(tk.Canvas):
         t0 = time.time()
         while self.running:
             t = time.time() - t0
-            self.update_layers(t)
-            self.update_shadows()
-            self.after(40)
-            time.sleep(0.04)
+            draw = self.render_queue.begin()
+            self.update_layers(draw, t)
+            self.update_shadows(draw)
+            self.render_queue.submit(draw)
+            time.sleep(0.08)
 
-    def update_layers(self, t):
+    def update_layers(self, draw, t):
         for layer in self.layers:
             # Oscillate radius subtly and position with sine waves out of phase
             r = layer['base_r'] + 6*math.sin(t*2 + layer['phase']*3)
@@ -71,16 +80,16 @@ class RemorseCanvas(tk.Canvas):
             y0 = layer['base_y'] - r + offset_y
             x1 = layer['base_x'] + r + offset_x
             y1 = layer['base_y'] + r + offset_y
-            self.coords(layer['oval'], x0, y0, x1, y1)
+            draw.coords(layer['oval'], x0, y0, x1, y1)
 
-    def update_shadows(self):
+    def update_shadows(self, draw):
         # Randomly create shadow spots that appear and fade quickly,
         # representing fleeting flashes of guilt or weight
         if len(self.shadows) < 12 and random.random() < 0.1:
             x = random.uniform(self.width*0.3, self.width*0.7)
             y = random.uniform(self.height*0.3, self.height*0.7)
             size = random.uniform(8, 18)
-            oval = self.create_oval(x-size, y-size, x+size, y+size, fill='#000000', outline='')
+            oval = draw.create_oval(x-size, y-size, x+size, y+size, fill='#000000', outline='')
             life = 25
             self.shadows.append({'id': oval, 'life': life})
 
@@ -91,9 +100,9 @@ class RemorseCanvas(tk.Canvas):
             # simulate fade by changing fill color grayscale closer to transparent by blending with background
             gray_val = int(alpha*80)
             color = f'#{gray_val:02x}{gray_val:02x}{gray_val:02x}'
-            self.itemconfig(shadow['id'], fill=color)
+            draw.itemconfig(shadow['id'], fill=color)
             if shadow['life'] <= 0:
-                self.delete(shadow['id'])
+                draw.delete(shadow['id'])
                 to_remove.append(shadow)
         for rem in to_remove:
             self.shadows.remove(rem)
@@ -3,15 +3,21 @@ import tkinter as tk
 import random
 import math
 import colorsys
+import os
+import sys
 from threading import Thread
 from queue import Queue
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.canvas_pool import CanvasPool
+
 class TrepidationCanvas:
     def __init__(self, master):
         self.master = master
         self.canvas = tk.Canvas(master, bg='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.pool = CanvasPool(self.canvas, layers=('streams', 'particles'))
         
         self.width = master.winfo_screenwidth()
         self.height = master.winfo_screenheight()
@@ -63,7 +69,7 @@ class TrepidationCanvas:
         self.master.after(50, self._render_emotional_landscape)
 
     def _render_emotional_landscape(self):
-        self.canvas.delete('all')
+        self.pool.begin_frame()
         
         for stream in self.uncertainty_streams:
             hue = math.sin(stream['phase']) * 0.5 + 0.5
@@ -75,7 +81,8 @@ class TrepidationCanvas:
             x = stream['x'] + displacement * stream['velocity']
             y = stream['y'] + displacement * stream['velocity']
             
-            self.canvas.create_line(
+            self.pool.line(
+                'streams',
                 stream['x'], stream['y'], x, y, 
                 fill=f'#{r:02x}{g:02x}{b:02x}', 
                 width=max(0.1, abs(displacement) * 0.5)
@@ -93,7 +100,8 @@ class TrepidationCanvas:
             opacity = int(particle['opacity'] * 255)
             size = particle['size'] * self.perceptual_tremor
             
-            self.canvas.create_oval(
+            self.pool.oval(
+                'particles',
                 particle['x'], particle['y'], 
                 particle['x'] + size, particle['y'] + size, 
                 fill=f'rgba(255, 255, 255, {opacity/255})', 
@@ -105,6 +113,7 @@ class TrepidationCanvas:
                 particle['x'] = random.uniform(0, self.width)
                 particle['y'] = random.uniform(0, self.height)
         
+        self.pool.end_frame()
         self.master.after(50, self._render_emotional_landscape)
 
 def manifest_trepidation():
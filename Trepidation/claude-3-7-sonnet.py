@@ -1,3 +1,5 @@
+import os
+import sys
 import pygame
 import numpy as np
 import random
@@ -5,6 +7,10 @@ import math
 import time
 from pygame import gfxdraw
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.quality import QualityController
+from gallery.spans import Profiler, trace_path
+
 # Initialize pygame
 pygame.init()
 pygame.mixer.init()
@@ -260,8 +266,8 @@ class AnxietyFocus:
         g = min(255, self.base_color[1] + int(15 * math.sin(t * 0.7 + 1)))
         b = min(255, self.base_color[2] + int(25 * math.sin(t * 0.9 + 2)))
         
-        # Draw with gradient and blur effect
-        for i in range(int(size), 0, -1):
+        # Draw with gradient and blur effect, skipping rings at lower quality
+        for i in range(int(size), 0, -quality.pick(1, 3)):
             alpha = 100 * (i / size)**2  # Fade out from center
             color = (r, g, b, int(alpha))
             gfxdraw.filled_circle(screen, int(self.x), int(self.y), i, color)
@@ -348,104 +354,135 @@ mouse_dx, mouse_dy = 0, 0
 running = True
 last_time = time.time()
 clock = pygame.time.Clock()
+# F3 shows where each frame's time goes; --trace FILE writes it out on exit
+profiler = Profiler(trace=trace_path())
+# Fewer vignette and focus rings, and fewer particles, when frames run over budget
+quality = QualityController(fps=60)
 
 while running:
+    quality.begin_frame()
     current_time = time.time()
     dt = current_time - last_time
     last_time = current_time
     
     # Event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
+    with profiler.span('events'):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_F3:
+                    profiler.toggle_hud()
+        
+        # Track mouse position and speed
+        prev_mouse_x, prev_mouse_y = mouse_x, mouse_y
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_dx = mouse_x - prev_mouse_x
+        mouse_dy = mouse_y - prev_mouse_y
+        mouse_speed = math.sqrt(mouse_dx**2 + mouse_dy**2)
     
-    # Track mouse position and speed
-    prev_mouse_x, prev_mouse_y = mouse_x, mouse_y
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    mouse_dx = mouse_x - prev_mouse_x
-    mouse_dy = mouse_y - prev_mouse_y
-    mouse_speed = math.sqrt(mouse_dx**2 + mouse_dy**2)
-    
-    # Create new particles with trepidation
-    spawn_rate = 3 + int(mouse_speed * 0.5)
-    if random.random() < 0.7:  # Hesitation in spawning
-        for _ in range(spawn_rate):
-            # Spawn near mouse with uncertainty
-            offset_x = random.uniform(-50, 50)
-            offset_y = random.uniform(-50, 50)
-            particles.append(Particle(mouse_x + offset_x, mouse_y + offset_y))
-    
-    # Create thought lines occasionally
-    if random.random() < 0.02:
-        thought_lines.append(ThoughtLine())
-    
-    # Update particles with trepidation
-    particles = [p for p in particles if not p.update((mouse_x, mouse_y), mouse_speed)]
-    
-    # Update thought lines
-    thought_lines = [l for l in thought_lines if not l.update()]
-    
-    # Update anxiety focus
-    anxiety_focus.update()
-    
-    # Update sound
-    anxiety_sound.update()
-    
-    # Clear screen with subtle fade effect
-    screen.fill(bg_color)
-    
-    # Draw a subtle vignette
-    vignette_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    for i in range(10):
-        radius = min(WIDTH, HEIGHT) * (0.7 + i * 0.03)
-        alpha = 5 - i * 0.5
-        pygame.draw.circle(vignette_surface, (0, 0, 0, alpha), (WIDTH // 2, HEIGHT // 2), int(radius))
-    screen.blit(vignette_surface, (0, 0))
-    
-    # Draw anxiety focus (background element)
-    anxiety_focus.draw()
-    
-    # Draw thought lines
-    for line in thought_lines:
-        line.draw()
-    
-    # Draw particles
-    for p in particles:
-        p.draw()
-    
-    # Subtle text overlay that fades in and out
-    font = pygame.font.SysFont(None, 24)
+    with profiler.span('update'):
+        # Create new particles with trepidation
+        with profiler.span('spawn'):
+            spawn_rate = 3 + int(mouse_speed * 0.5)
+            # Below full quality, never past the particle cap for the current level; at full
+            # quality particles are not capped, as in the original piece
+            if quality.level < 1.0:
+                spawn_rate = min(spawn_rate, max(0, quality.pick(1000, 200) - len(particles)))
+            if random.random() < 0.7:  # Hesitation in spawning
+                for _ in range(spawn_rate):
+                    # Spawn near mouse with uncertainty
+                    offset_x = random.uniform(-50, 50)
+                    offset_y = random.uniform(-50, 50)
+                    particles.append(Particle(mouse_x + offset_x, mouse_y + offset_y))
+            
+            # Create thought lines occasionally
+            if random.random() < 0.02:
+                thought_lines.append(ThoughtLine())
+        
+        # Update particles with trepidation
+        with profiler.span('particles'):
+            particles = [p for p in particles if not p.update((mouse_x, mouse_y), mouse_speed)]
+        
+        # Update thought lines
+        with profiler.span('thought lines'):
+            thought_lines = [l for l in thought_lines if not l.update()]
+        
+        # Update anxiety focus
+        with profiler.span('focus'):
+            anxiety_focus.update()
+        
+        # Update sound
+        with profiler.span('sound'):
+            anxiety_sound.update()
     
-    # Choose a message with uncertain timing
-    messages = [
-        "...",
-        "what if...",
-        "but...",
-        "should I...",
-        "wait...",
-        "uncertain...",
-        "hesitant...",
-    ]
+    with profiler.span('draw'):
+        # Clear screen with subtle fade effect
+        screen.fill(bg_color)
+        
+        # Draw a subtle vignette
+        with profiler.span('vignette'):
+            vignette_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            for i in range(quality.pick(10, 4)):
+                radius = min(WIDTH, HEIGHT) * (0.7 + i * 0.03)
+                alpha = 5 - i * 0.5
+                pygame.draw.circle(vignette_surface, (0, 0, 0, alpha), (WIDTH // 2, HEIGHT // 2), int(radius))
+            screen.blit(vignette_surface, (0, 0))
+        
+        # Draw anxiety focus (background element)
+        with profiler.span('focus'):
+            anxiety_focus.draw()
+        
+        # Draw thought lines
+        with profiler.span('thought lines'):
+            for line in thought_lines:
+                line.draw()
+        
+        # Draw particles
+        with profiler.span('particles'):
+            for p in particles:
+                p.draw()
+        
+        # Subtle text overlay that fades in and out
+        with profiler.span('text'):
+            font = pygame.font.SysFont(None, 24)
+            
+            # Choose a message with uncertain timing
+            messages = [
+                "...",
+                "what if...",
+                "but...",
+                "should I...",
+                "wait...",
+                "uncertain...",
+                "hesitant...",
+            ]
+            
+            # Display text with uncertainty
+            pulse = (math.sin(time.time() * 0.5) + 1) / 2
+            if pulse > 0.8 and random.random() < 0.3:
+                message = random.choice(messages)
+                alpha = int(pulse * 40)
+                text = font.render(message, True, (255, 255, 255, alpha))
+                text_rect = text.get_rect(center=(WIDTH//2 + random.uniform(-100, 100), 
+                                                 HEIGHT//2 + random.uniform(-80, 80)))
+                text.set_alpha(alpha)
+                screen.blit(text, text_rect)
     
-    # Display text with uncertainty
-    pulse = (math.sin(time.time() * 0.5) + 1) / 2
-    if pulse > 0.8 and random.random() < 0.3:
-        message = random.choice(messages)
-        alpha = int(pulse * 40)
-        text = font.render(message, True, (255, 255, 255, alpha))
-        text_rect = text.get_rect(center=(WIDTH//2 + random.uniform(-100, 100), 
-                                         HEIGHT//2 + random.uniform(-80, 80)))
-        text.set_alpha(alpha)
-        screen.blit(text, text_rect)
+    profiler.draw_hud(screen)
     
     # Update display
-    pygame.display.flip()
+    with profiler.span('flip'):
+        pygame.display.flip()
+    quality.end_frame()
     
     # Cap at 60 FPS
-    clock.tick(60)
+    with profiler.span('wait'):
+        clock.tick(60)
+    profiler.end_frame()
 
 # Clean up
+profiler.close()
 pygame.quit()
\ No newline at end of file
@@ -1,11 +1,13 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from matplotlib.collections import LineCollection
+from matplotlib.markers import MarkerStyle
 import numpy as np
+import sys
 import time
-import random
 
 class TrepidationField:
-    def __init__(self):
+    def __init__(self, n_particles=47):
         self.fig, self.ax = plt.subplots(figsize=(12, 8), facecolor='black')
         self.ax.set_facecolor('black')
         self.ax.set_xlim(-10, 10)
@@ -13,7 +15,7 @@ class TrepidationField:
         self.ax.axis('off')
         
         # Uncertain particles - they approach but hesitate
-        self.n_particles = 47
+        self.n_particles = n_particles
         self.particles = {
             'x': np.random.uniform(-8, 8, self.n_particles),
             'y': np.random.uniform(-8, 8, self.n_particles),
@@ -30,9 +32,9 @@ class TrepidationField:
         self.threshold_y = 0
         
         # Probability branches - multiple futures
-        self.branch_points = []
-        self.branch_alpha = []
-        self.branch_colors = []
+        self.branch_points = np.empty((0, 2, 2))
+        self.branch_alpha = np.empty(0)
+        self.branch_colors = np.empty((0, 3))
         
         # Time dilation factor - trepidation stretches time
         self.time_dilation = 1.0
@@ -42,6 +44,25 @@ class TrepidationField:
         self.rhythm_phase = 0
         self.rhythm_irregularity = 0
         
+        # Persistent artists - updated in place every frame instead of re-created
+        self.threshold_circle = plt.Circle((self.threshold_x, self.threshold_y), 1.5,
+                                           color=(0.7, 0.3, 0.3), fill=False, linewidth=2, animated=True)
+        self.ax.add_patch(self.threshold_circle)
+        
+        self.branch_lines = LineCollection([], linewidths=0.8, animated=True)
+        self.ax.add_collection(self.branch_lines)
+        
+        self.trail_scatter = self.ax.scatter([], [], marker='.', edgecolors='face', animated=True)
+        
+        self.particle_scatter = self.ax.scatter([], [], marker='o', edgecolors='face', animated=True)
+        marker_paths = []
+        for marker in ('o', 's'):
+            style = MarkerStyle(marker)
+            marker_paths.append(style.get_path().transformed(style.get_transform()))
+        self.marker_paths = marker_paths
+        
+        self.artists = [self.threshold_circle, self.branch_lines, self.trail_scatter, self.particle_scatter]
+        
     def calculate_uncertainty_field(self, x, y):
         # Distance from threshold creates tension
         dist_to_threshold = np.sqrt((x - self.threshold_x)**2 + (y - self.threshold_y)**2)
@@ -60,8 +81,7 @@ class TrepidationField:
         self.last_real_time = current_time
         
         # Trepidation makes time feel thick, irregular
-        global_uncertainty = np.mean([self.calculate_uncertainty_field(x, y) 
-                                    for x, y in zip(self.particles['x'], self.particles['y'])])
+        global_uncertainty = np.mean(self.calculate_uncertainty_field(self.particles['x'], self.particles['y']))
         
         self.time_dilation = 0.3 + 0.7 * global_uncertainty + 0.2 * np.sin(self.rhythm_phase * 2.7)
         self.rhythm_irregularity = 0.1 * np.sin(self.rhythm_phase * 0.7) * global_uncertainty
@@ -71,106 +91,96 @@ class TrepidationField:
         return dt_real * self.time_dilation
     
     def update_particles(self, dt):
-        for i in range(self.n_particles):
-            x, y = self.particles['x'][i], self.particles['y'][i]
-            
-            # Calculate local uncertainty
-            uncertainty = self.calculate_uncertainty_field(x, y)
-            
-            # Direction toward threshold
-            dx_to_threshold = self.threshold_x - x
-            dy_to_threshold = self.threshold_y - y
-            dist_to_threshold = np.sqrt(dx_to_threshold**2 + dy_to_threshold**2)
-            
-            if dist_to_threshold > 0:
-                approach_x = dx_to_threshold / dist_to_threshold
-                approach_y = dy_to_threshold / dist_to_threshold
-            else:
-                approach_x = approach_y = 0
-            
-            # Hesitation increases near threshold
-            hesitation_factor = self.particles['hesitation'][i] * uncertainty
-            
-            # Sometimes we retreat from what we approach
-            if uncertainty > 0.6 and random.random() < hesitation_factor * dt:
-                self.particles['retreat_memory'][i] = min(1.0, self.particles['retreat_memory'][i] + 0.3)
-            else:
-                self.particles['retreat_memory'][i] *= 0.95
-            
-            # Multiple conflicting forces
-            approach_force = self.particles['approach_strength'][i] * (1 - hesitation_factor)
-            retreat_force = self.particles['retreat_memory'][i] * 2
-            
-            # Lateral uncertainty - we don't know which way
-            lateral_x = np.sin(self.particles['phase'][i] + self.rhythm_phase) * uncertainty
-            lateral_y = np.cos(self.particles['phase'][i] * 1.3 + self.rhythm_phase) * uncertainty
-            
-            # Update velocity with hesitation
-            self.particles['vx'][i] = (approach_force * approach_x - retreat_force * approach_x + lateral_x * 0.5) * dt
-            self.particles['vy'][i] = (approach_force * approach_y - retreat_force * approach_y + lateral_y * 0.5) * dt
-            
-            # Apply hesitation to movement
-            hesitation_multiplier = 1.0 - hesitation_factor * 0.8
-            self.particles['vx'][i] *= hesitation_multiplier
-            self.particles['vy'][i] *= hesitation_multiplier
-            
-            # Update position
-            self.particles['x'][i] += self.particles['vx'][i]
-            self.particles['y'][i] += self.particles['vy'][i]
-            
-            # Update phase for continued uncertainty
-            self.particles['phase'][i] += dt * (1 + uncertainty)
-            
-            # Boundary conditions - we can't escape the field entirely
-            if abs(self.particles['x'][i]) > 9:
-                self.particles['x'][i] *= 0.9
-                self.particles['vx'][i] *= -0.3
-            if abs(self.particles['y'][i]) > 9:
-                self.particles['y'][i] *= 0.9
-                self.particles['vy'][i] *= -0.3
+        p = self.particles
+        x, y = p['x'], p['y']
+        
+        # Calculate local uncertainty for the whole field at once
+        uncertainty = self.calculate_uncertainty_field(x, y)
+        
+        # Direction toward threshold
+        dx_to_threshold = self.threshold_x - x
+        dy_to_threshold = self.threshold_y - y
+        dist_to_threshold = np.sqrt(dx_to_threshold**2 + dy_to_threshold**2)
+        
+        safe_dist = np.where(dist_to_threshold > 0, dist_to_threshold, 1.0)
+        approach_x = np.where(dist_to_threshold > 0, dx_to_threshold / safe_dist, 0.0)
+        approach_y = np.where(dist_to_threshold > 0, dy_to_threshold / safe_dist, 0.0)
+        
+        # Hesitation increases near threshold
+        hesitation_factor = p['hesitation'] * uncertainty
+        
+        # Sometimes we retreat from what we approach
+        retreating = (uncertainty > 0.6) & (np.random.random(self.n_particles) < hesitation_factor * dt)
+        p['retreat_memory'] = np.where(retreating,
+                                       np.minimum(1.0, p['retreat_memory'] + 0.3),
+                                       p['retreat_memory'] * 0.95)
+        
+        # Multiple conflicting forces
+        approach_force = p['approach_strength'] * (1 - hesitation_factor)
+        retreat_force = p['retreat_memory'] * 2
+        
+        # Lateral uncertainty - we don't know which way
+        lateral_x = np.sin(p['phase'] + self.rhythm_phase) * uncertainty
+        lateral_y = np.cos(p['phase'] * 1.3 + self.rhythm_phase) * uncertainty
+        
+        # Update velocity with hesitation
+        hesitation_multiplier = 1.0 - hesitation_factor * 0.8
+        p['vx'] = (approach_force * approach_x - retreat_force * approach_x + lateral_x * 0.5) * dt * hesitation_multiplier
+        p['vy'] = (approach_force * approach_y - retreat_force * approach_y + lateral_y * 0.5) * dt * hesitation_multiplier
+        
+        # Update position
+        x += p['vx']
+        y += p['vy']
+        
+        # Update phase for continued uncertainty
+        p['phase'] += dt * (1 + uncertainty)
+        
+        # Boundary conditions - we can't escape the field entirely
+        out_x = np.abs(x) > 9
+        x[out_x] *= 0.9
+        p['vx'][out_x] *= -0.3
+        out_y = np.abs(y) > 9
+        y[out_y] *= 0.9
+        p['vy'][out_y] *= -0.3
     
     def update_probability_branches(self):
-        # Clear old branches
-        self.branch_points = []
-        self.branch_alpha = []
-        self.branch_colors = []
-        
         # Create branches from current state to possible futures
-        for i in range(0, self.n_particles, 3):
-            x, y = self.particles['x'][i], self.particles['y'][i]
-            uncertainty = self.calculate_uncertainty_field(x, y)
-            
-            if uncertainty > 0.3:
-                # Multiple possible paths from this point
-                n_branches = int(3 + uncertainty * 4)
-                for j in range(n_branches):
-                    angle = 2 * np.pi * j / n_branches + self.rhythm_phase * 0.1
-                    length = uncertainty * 2 * (0.5 + 0.5 * np.sin(self.rhythm_phase + j))
-                    
-                    end_x = x + length * np.cos(angle)
-                    end_y = y + length * np.sin(angle)
-                    
-                    self.branch_points.append([(x, y), (end_x, end_y)])
-                    self.branch_alpha.append(uncertainty * 0.3 * (0.3 + 0.7 * np.sin(self.rhythm_phase * 2 + j)))
-                    
-                    # Color represents different possible emotional outcomes
-                    hue = (uncertainty + j * 0.3 + self.rhythm_phase * 0.1) % 1.0
-                    if hue < 0.3:  # Blue-violet - deep uncertainty
-                        color = (0.3 + hue, 0.1, 0.7 + hue * 0.3)
-                    elif hue < 0.7:  # Grey-green - suspended state
-                        color = (0.4, 0.3 + (hue-0.3) * 0.5, 0.3)
-                    else:  # Dark orange - anxious energy
-                        color = (0.6 + (hue-0.7) * 0.4, 0.3 + (hue-0.7) * 0.3, 0.1)
-                    
-                    self.branch_colors.append(color)
+        x = self.particles['x'][::3]
+        y = self.particles['y'][::3]
+        uncertainty = self.calculate_uncertainty_field(x, y)
+        branching = uncertainty > 0.3
+        x, y, uncertainty = x[branching], y[branching], uncertainty[branching]
+        
+        # Multiple possible paths from each point
+        n_branches = (3 + uncertainty * 4).astype(int)
+        owner = np.repeat(np.arange(len(n_branches)), n_branches)
+        starts = np.cumsum(n_branches) - n_branches
+        j = np.arange(len(owner)) - starts[owner]
+        x, y, uncertainty, n = x[owner], y[owner], uncertainty[owner], n_branches[owner]
+        
+        angle = 2 * np.pi * j / n + self.rhythm_phase * 0.1
+        length = uncertainty * 2 * (0.5 + 0.5 * np.sin(self.rhythm_phase + j))
+        end_x = x + length * np.cos(angle)
+        end_y = y + length * np.sin(angle)
+        
+        self.branch_points = np.stack([np.column_stack([x, y]), np.column_stack([end_x, end_y])], axis=1)
+        self.branch_alpha = uncertainty * 0.3 * (0.3 + 0.7 * np.sin(self.rhythm_phase * 2 + j))
+        
+        # Color represents different possible emotional outcomes
+        hue = (uncertainty + j * 0.3 + self.rhythm_phase * 0.1) % 1.0
+        deep = hue < 0.3          # Blue-violet - deep uncertainty
+        anxious = hue >= 0.7      # Dark orange - anxious energy
+        colors = np.empty((len(hue), 3))
+        colors[:] = np.column_stack([np.full_like(hue, 0.4), 0.3 + (hue - 0.3) * 0.5, np.full_like(hue, 0.3)])  # Grey-green - suspended state
+        colors[deep] = np.column_stack([0.3 + hue[deep], np.full(deep.sum(), 0.1), 0.7 + hue[deep] * 0.3])
+        colors[anxious] = np.column_stack([0.6 + (hue[anxious] - 0.7) * 0.4, 0.3 + (hue[anxious] - 0.7) * 0.3,
+                                           np.full(anxious.sum(), 0.1)])
+        self.branch_colors = colors
+    
+    def init_artists(self):
+        return self.artists
     
     def animate(self, frame):
-        self.ax.clear()
-        self.ax.set_facecolor('black')
-        self.ax.set_xlim(-10, 10)
-        self.ax.set_ylim(-10, 10)
-        self.ax.axis('off')
-        
         dt = self.update_time_perception()
         self.update_particles(dt)
         self.update_probability_branches()
@@ -178,59 +188,65 @@ class TrepidationField:
         # Draw threshold as uncertain, wavering target
         threshold_radius = 1.5 + 0.5 * np.sin(self.rhythm_phase * 3)
         threshold_alpha = 0.2 + 0.3 * np.sin(self.rhythm_phase * 1.7)
-        circle = plt.Circle((self.threshold_x, self.threshold_y), threshold_radius, 
-                          color=(0.7, 0.3, 0.3), alpha=threshold_alpha, fill=False, linewidth=2)
-        self.ax.add_patch(circle)
-        
-        # Draw probability branches first (background layer)
-        for i, (points, alpha, color) in enumerate(zip(self.branch_points, self.branch_alpha, self.branch_colors)):
-            if alpha > 0.05:
-                xs = [points[0][0], points[1][0]]
-                ys = [points[0][1], points[1][1]]
-                self.ax.plot(xs, ys, color=color, alpha=alpha, linewidth=0.8)
-        
-        # Draw particles with uncertainty-based appearance
-        for i in range(self.n_particles):
-            x, y = self.particles['x'][i], self.particles['y'][i]
-            uncertainty = self.calculate_uncertainty_field(x, y)
-            
-            # Size based on uncertainty
-            size = 20 + uncertainty * 80
-            
-            # Color shift based on emotional state
-            retreat = self.particles['retreat_memory'][i]
-            hesitation = self.particles['hesitation'][i]
-            
-            # Base color computation
-            r = 0.1 + uncertainty * 0.4 + retreat * 0.3
-            g = 0.2 + hesitation * 0.3 + 0.1 * np.sin(self.rhythm_phase + i)
-            b = 0.4 + uncertainty * 0.5 - retreat * 0.2
-            
-            alpha = 0.3 + uncertainty * 0.6
-            
-            self.ax.scatter(x, y, s=size, c=[(r, g, b)], alpha=alpha, 
-                          marker='o' if uncertainty < 0.5 else 's')
-            
-            # Add uncertainty trails
-            if uncertainty > 0.4:
-                trail_length = int(uncertainty * 5)
-                for t in range(1, trail_length):
-                    trail_x = x - self.particles['vx'][i] * t * 3
-                    trail_y = y - self.particles['vy'][i] * t * 3
-                    trail_alpha = alpha * (1 - t / trail_length) * 0.3
-                    if trail_alpha > 0.02:
-                        self.ax.scatter(trail_x, trail_y, s=size * (1 - t / trail_length), 
-                                      c=[(r, g, b)], alpha=trail_alpha, marker='.')
-        
-        plt.title('', color='white')
-        return []
+        self.threshold_circle.set_radius(threshold_radius)
+        self.threshold_circle.set_alpha(float(np.clip(threshold_alpha, 0, 1)))
+        
+        # Probability branches (background layer)
+        visible = self.branch_alpha > 0.05
+        self.branch_lines.set_segments(self.branch_points[visible])
+        self.branch_lines.set_color(np.column_stack([self.branch_colors[visible], self.branch_alpha[visible]]))
+        
+        # Particles with uncertainty-based appearance
+        x, y = self.particles['x'], self.particles['y']
+        uncertainty = self.calculate_uncertainty_field(x, y)
+        retreat = self.particles['retreat_memory']
+        hesitation = self.particles['hesitation']
+        
+        # Size based on uncertainty
+        size = 20 + uncertainty * 80
+        
+        # Color shift based on emotional state
+        rgba = np.column_stack([
+            0.1 + uncertainty * 0.4 + retreat * 0.3,
+            0.2 + hesitation * 0.3 + 0.1 * np.sin(self.rhythm_phase + np.arange(self.n_particles)),
+            0.4 + uncertainty * 0.5 - retreat * 0.2,
+            0.3 + uncertainty * 0.6,
+        ])
+        rgba = np.clip(rgba, 0, 1)
+        
+        self.particle_scatter.set_offsets(np.column_stack([x, y]))
+        self.particle_scatter.set_sizes(size)
+        self.particle_scatter.set_paths([self.marker_paths[k] for k in (uncertainty >= 0.5).astype(int).tolist()])
+        self.particle_scatter.set_facecolor(rgba)
+        self.particle_scatter.set_edgecolor(rgba)
+        
+        # Uncertainty trails
+        trail_length = np.where(uncertainty > 0.4, (uncertainty * 5).astype(int), 0)
+        t = np.arange(1, max(int(trail_length.max(initial=0)), 1))
+        fade = 1 - t[None, :] / np.maximum(trail_length, 1)[:, None]
+        trail_alpha = rgba[:, 3:4] * fade * 0.3
+        in_trail = (t[None, :] < trail_length[:, None]) & (trail_alpha > 0.02)
+        owner, step = np.nonzero(in_trail)
+        
+        trail_rgba = rgba[owner].copy()
+        trail_rgba[:, 3] = trail_alpha[owner, step]
+        self.trail_scatter.set_offsets(np.column_stack([
+            x[owner] - self.particles['vx'][owner] * t[step] * 3,
+            y[owner] - self.particles['vy'][owner] * t[step] * 3,
+        ]))
+        self.trail_scatter.set_sizes(size[owner] * fade[owner, step])
+        self.trail_scatter.set_facecolor(trail_rgba)
+        self.trail_scatter.set_edgecolor(trail_rgba)
+        
+        return self.artists
 
-def main():
-    field = TrepidationField()
-    ani = animation.FuncAnimation(field.fig, field.animate, interval=50, blit=False, cache_frame_data=False)
+def main(n_particles=47):
+    field = TrepidationField(n_particles)
+    ani = animation.FuncAnimation(field.fig, field.animate, init_func=field.init_artists,
+                                  interval=50, blit=True, cache_frame_data=False)
     
     plt.tight_layout()
     plt.show()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 47)
\ No newline at end of file
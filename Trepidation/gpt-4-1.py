@@ -6,6 +6,7 @@ import time
 import random
 import math
 import pygame
+import numpy as np
 
 pygame.init()
 WIDTH, HEIGHT = 720, 480
@@ -54,7 +55,8 @@ class Line:
 lines = [Line() for _ in range(7)]
 dots = [(random.randint(0, WIDTH), random.randint(0, HEIGHT)) for _ in range(77)]
 
-def vignette():
+# Overlay layers - built once and reused every frame
+def build_vignette():
     s = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     for i in range(220):
         a = int(200 * (i / 220.0) ** 1.7)
@@ -63,7 +65,17 @@ def vignette():
             pygame.Rect(-i, -i, WIDTH+2*i, HEIGHT+2*i), 
             width=0
         )
-    SCREEN.blit(s, (0,0))
+    return s
+
+VIGNETTE = build_vignette()
+BAR_X = np.arange(0, WIDTH, 17)
+BAR_INSIDE = BAR_X + 1 < WIDTH
+BARS = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+BARS.fill((32, 32, 40, 0))
+BLUR_SCRATCH = pygame.Surface((120, 50), pygame.SRCALPHA)
+
+def vignette():
+    SCREEN.blit(VIGNETTE, (0,0))
 
 def random_blur():
     for _ in range(random.randint(2,4)):
@@ -72,16 +84,18 @@ def random_blur():
         w = random.randint(20, 120)
         h = random.randint(8, 50)
         c = (29, 21, 27, random.randint(13,45))
-        surf = pygame.Surface((w, h), pygame.SRCALPHA)
-        surf.fill(c)
-        SCREEN.blit(surf, (x, y))
+        area = pygame.Rect(0, 0, w, h)
+        BLUR_SCRATCH.fill(c, area)
+        SCREEN.blit(BLUR_SCRATCH, (x, y), area)
 
 def vertical_lines(t):
-    for x in range(0, WIDTH, 17):
-        col = (32, 32, 40, 9+int(11*math.fabs(math.sin(t*0.3 + x*0.019))))
-        surf = pygame.Surface((2, HEIGHT), pygame.SRCALPHA)
-        surf.fill(col)
-        SCREEN.blit(surf, (x, 0))
+    # one alpha value per bar, looked up this frame and written into the 2px columns of the bar layer
+    row = 9 + (11 * np.abs(np.sin(t*0.3 + BAR_X*0.019))).astype(np.uint8)
+    alpha = pygame.surfarray.pixels_alpha(BARS)
+    alpha[BAR_X, :] = row[:, None]
+    alpha[BAR_X[BAR_INSIDE] + 1, :] = row[BAR_INSIDE, None]
+    del alpha
+    SCREEN.blit(BARS, (0, 0))
 
 def message(msg, t):
     s = font.render(msg, True, RED if int(t*3)%5==0 else (19,22,29))
@@ -1,6 +1,7 @@
 import pygame
 import random
 import math
+import numpy as np
 
 pygame.init()
 
@@ -29,16 +30,30 @@ def spiral_surface(time):
         pygame.draw.lines(surface, (255, random.randint(0, 40), random.randint(0, 40), 50), False, points, 4)
     return surface
 
-def noise_overlay():
+# fraction of pixels that flicker each frame, and how many noise frames to pre-bake (0 = fresh noise every frame)
+NOISE_DENSITY = 3000 / (800 * 600)
+NOISE_FRAMES = 0
+
+def make_noise_surface():
     noise = pygame.Surface((width, height), pygame.SRCALPHA)
-    for _ in range(3000):
-        x, y = random.randint(0, width), random.randint(0, height)
-        alpha = random.randint(0, 40)
-        noise.set_at((x, y), (255, 255, 255, alpha))
+    noise.fill((255, 255, 255, 0))
+    return noise
+
+def noise_overlay(noise):
+    # white pixels everywhere; only the alpha channel is rewritten
+    count = int(width * height * NOISE_DENSITY)
+    alpha = pygame.surfarray.pixels_alpha(noise)
+    alpha.fill(0)
+    alpha[np.random.randint(0, width, count), np.random.randint(0, height, count)] = np.random.randint(0, 41, count)
+    del alpha
     return noise
 
+noise_surface = make_noise_surface()
+noise_frames = [noise_overlay(make_noise_surface()) for _ in range(NOISE_FRAMES)]
+
 running = True
 time = 0
+frame = 0
 
 while running:
     screen.fill((0, 0, 0))
@@ -48,7 +63,10 @@ while running:
             running = False
 
     spiral = spiral_surface(time)
-    noise = noise_overlay()
+    if noise_frames:
+        noise = noise_frames[frame % len(noise_frames)]
+    else:
+        noise = noise_overlay(noise_surface)
 
     screen.blit(spiral, (0, 0))
     screen.blit(noise, (0, 0))
@@ -56,5 +74,6 @@ while running:
     pygame.display.flip()
     clock.tick(60)
     time += 0.02
+    frame += 1
 
 pygame.quit()
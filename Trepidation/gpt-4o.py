@@ -4,6 +4,10 @@ import threading
 import time
 from playsound import playsound
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.render_queue import RenderQueue
 
 root = tk.Tk()
 root.title("Trepidation")
@@ -13,24 +17,31 @@ root.attributes("-topmost", True)
 
 canvas = tk.Canvas(root, width=800, height=600, bg="black", highlightthickness=0)
 canvas.pack()
+# The threads below only record draw lists; the main thread runs them once per frame
+render_queue = RenderQueue(canvas)
 
 def draw_noise():
+    draw = render_queue.begin()
     while True:
         for _ in range(100):
             x = random.randint(0, 800)
             y = random.randint(0, 600)
             color = f'#{random.randint(20,40):02x}{random.randint(0,10):02x}{random.randint(0,10):02x}'
-            canvas.create_oval(x, y, x+2, y+2, fill=color, outline="")
+            draw.create_oval(x, y, x+2, y+2, fill=color, outline="")
+        render_queue.submit(draw)
         time.sleep(0.05)
-        canvas.delete("all")
+        draw = render_queue.begin()
+        draw.delete("all")
 
 def pulse_circle():
     r = 5
     grow = True
     while True:
-        canvas.delete("pulse")
+        draw = render_queue.begin()
+        draw.delete("pulse")
         x, y = 400, 300
-        canvas.create_oval(x-r, y-r, x+r, y+r, outline="red", width=2, tag="pulse")
+        draw.create_oval(x-r, y-r, x+r, y+r, outline="red", width=2, tag="pulse")
+        render_queue.submit(draw)
         if grow:
             r += 1
             if r > 100:
@@ -44,13 +55,15 @@ def pulse_circle():
 def twitch_text():
     messages = ["?", ".", "wait", "wrong", "watch", "why", "now?", "no", "what", "!", "!", "shh"]
     while True:
-        canvas.delete("text")
+        draw = render_queue.begin()
+        draw.delete("text")
         msg = random.choice(messages)
         x = random.randint(50, 750)
         y = random.randint(50, 550)
         font = ("Courier", random.randint(10, 24), "bold")
         color = random.choice(["#ff3333", "#993333", "#ff9999", "#330000"])
-        canvas.create_text(x, y, text=msg, font=font, fill=color, tag="text")
+        draw.create_text(x, y, text=msg, font=font, fill=color, tag="text")
+        render_queue.submit(draw)
         time.sleep(random.uniform(0.1, 0.5))
 
 def sound_loop():
@@ -2,15 +2,19 @@
 import asyncio
 import random
 import colorsys
+import collections
 import pygame
 import numpy as np
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
+# A new set of connections is woven every frame; only the most recent are kept
+MAX_CONNECTIONS = 200
+
 class WhimsicalDream:
     def __init__(self):
         self.fragments = []
-        self.ephemeral_connections = []
+        self.ephemeral_connections = collections.deque(maxlen=MAX_CONNECTIONS)
         self.quantum_playground = None
 
     @dataclass
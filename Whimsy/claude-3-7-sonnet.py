@@ -5,19 +5,25 @@ import random
 import math
 import colorsys
 from datetime import datetime
+import os
+import sys
 import time
 import threading
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.render_queue import RenderQueue
+
 class Bubble:
-    def __init__(self, canvas, x, y, size, color, speed, direction):
-        self.canvas = canvas
+    def __init__(self, draw, x, y, size, color, speed, direction):
         self.x = x
         self.y = y
         self.size = size
         self.color = color
+        # Parsed once here, so fading never has to ask Tk for the color
+        self.rgb = tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
         self.speed = speed
         self.direction = direction
-        self.id = canvas.create_oval(x-size, y-size, x+size, y+size, 
+        self.id = draw.create_oval(x-size, y-size, x+size, y+size, 
                                     fill=color, outline='', tags="bubble")
         self.alive = True
         self.age = 0
@@ -25,10 +31,10 @@ class Bubble:
         self.wobble = random.random() * 0.1
         self.dance_factor = random.random() * 3
         
-    def update(self):
+    def update(self, draw):
         self.age += 1
         if self.age > self.max_age:
-            self.canvas.delete(self.id)
+            draw.delete(self.id)
             self.alive = False
             return False
         
@@ -51,16 +57,14 @@ class Bubble:
         opacity = 1 - (self.age / self.max_age)
         
         # Calculate new color with fading
-        r, g, b = self.canvas.winfo_rgb(self.color)
-        r, g, b = r/65535, g/65535, b/65535
+        r, g, b = self.rgb
         
-        new_color = f"#{int(r*255*opacity):02x}{int(g*255*opacity):02x}{int(b*255*opacity):02x}"
+        new_color = f"#{int(r*opacity):02x}{int(g*opacity):02x}{int(b*opacity):02x}"
         
         # Update the bubble's position and appearance
-        self.canvas.delete(self.id)
-        self.id = self.canvas.create_oval(self.x-self.size, self.y-self.size, 
-                                         self.x+self.size, self.y+self.size, 
-                                         fill=new_color, outline='', tags="bubble")
+        draw.coords(self.id, self.x-self.size, self.y-self.size, 
+                    self.x+self.size, self.y+self.size)
+        draw.itemconfig(self.id, fill=new_color)
         
         # Randomly change direction slightly for whimsical movement
         self.direction += (random.random() - 0.5) * 0.2
@@ -88,6 +92,8 @@ class WhimsicalVortex:
         # Create canvas
         self.canvas = Canvas(master, bg='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        # Bubbles are created and moved through draw lists, run on the main thread once per frame
+        self.render_queue = RenderQueue(self.canvas)
         
         # Bind escape key to exit
         master.bind('<Escape>', lambda e: master.destroy())
@@ -131,11 +137,6 @@ class WhimsicalVortex:
             y = self.center_y + math.sin(angle) * dist
             self.special_points.append((x, y))
         
-        # Start the animation
-        self.animation_thread = threading.Thread(target=self.animate)
-        self.animation_thread.daemon = True
-        self.animation_thread.start()
-        
         # Display a gentle prompt
         self.canvas.create_text(
             width // 2, 
@@ -154,6 +155,11 @@ class WhimsicalVortex:
         self.surprise_timer = random.randint(1000, 3000)
         self.last_surprise = 0
         
+        # Start the animation, once everything it reads has been set up
+        self.animation_thread = threading.Thread(target=self.animate)
+        self.animation_thread.daemon = True
+        self.animation_thread.start()
+        
     def on_mouse_move(self, event):
         # Create a small bubble occasionally on mouse move
         if random.random() < 0.1:
@@ -162,11 +168,14 @@ class WhimsicalVortex:
             speed = random.uniform(0.5, 2)
             direction = random.uniform(0, 2 * math.pi)
             
-            bubble = Bubble(self.canvas, event.x, event.y, size, color, speed, direction)
+            draw = self.render_queue.begin()
+            bubble = Bubble(draw, event.x, event.y, size, color, speed, direction)
+            self.render_queue.submit(draw)
             self.bubbles.append(bubble)
     
     def on_key_press(self, event):
         # Create a burst of bubbles
+        draw = self.render_queue.begin()
         for _ in range(20):
             color = random.choice(self.palette + self.special_colors)
             size = random.uniform(5, 15)
@@ -177,12 +186,14 @@ class WhimsicalVortex:
             offset_x = (random.random() - 0.5) * 100
             offset_y = (random.random() - 0.5) * 100
             
-            bubble = Bubble(self.canvas, self.center_x + offset_x, self.center_y + offset_y, 
+            bubble = Bubble(draw, self.center_x + offset_x, self.center_y + offset_y, 
                            size, color, speed, direction)
             self.bubbles.append(bubble)
+        self.render_queue.submit(draw)
     
     def on_click(self, event):
         # Create a bigger burst of bubbles with more variety
+        draw = self.render_queue.begin()
         for i in range(30):
             # Use special colors sometimes
             if random.random() < 0.3:
@@ -199,14 +210,15 @@ class WhimsicalVortex:
             # Direction is outward from click point, with some randomness
             angle = random.uniform(0, 2 * math.pi)
             
-            bubble = Bubble(self.canvas, event.x, event.y, size, color, speed, angle)
+            bubble = Bubble(draw, event.x, event.y, size, color, speed, angle)
             self.bubbles.append(bubble)
             
         # Sometimes add a special effect
         if random.random() < 0.3:
-            self.create_spiral(event.x, event.y)
+            self.create_spiral(draw, event.x, event.y)
+        self.render_queue.submit(draw)
     
-    def create_spiral(self, x, y):
+    def create_spiral(self, draw, x, y):
         # Create a spiral pattern of bubbles
         for i in range(30):
             angle = i * 0.5
@@ -224,10 +236,10 @@ class WhimsicalVortex:
                 size = 3
                 
             speed = 0.5 + (i * 0.05)
-            bubble = Bubble(self.canvas, bx, by, size, color, speed, angle)
+            bubble = Bubble(draw, bx, by, size, color, speed, angle)
             self.bubbles.append(bubble)
     
-    def create_surprise(self):
+    def create_surprise(self, draw):
         # Create a special surprise effect
         surprise_type = random.randint(1, 4)
         
@@ -239,7 +251,7 @@ class WhimsicalVortex:
                 size = random.uniform(5, 15)
                 color = random.choice(self.special_colors)
                 
-                bubble = Bubble(self.canvas, self.center_x, self.center_y, 
+                bubble = Bubble(draw, self.center_x, self.center_y, 
                                size, color, speed, angle)
                 self.bubbles.append(bubble)
                 
@@ -253,7 +265,7 @@ class WhimsicalVortex:
                 speed = random.uniform(2, 5)
                 angle = random.uniform(0, 2 * math.pi)
                 
-                bubble = Bubble(self.canvas, x, y, size, color, speed, angle)
+                bubble = Bubble(draw, x, y, size, color, speed, angle)
                 bubble.dance_factor = random.uniform(5, 10)  # More dancing
                 self.bubbles.append(bubble)
                 
@@ -275,7 +287,7 @@ class WhimsicalVortex:
                 speed = random.uniform(0.5, 2)
                 direction = angle + math.pi  # Move inward
                 
-                bubble = Bubble(self.canvas, x, y, size, color, speed, direction)
+                bubble = Bubble(draw, x, y, size, color, speed, direction)
                 self.bubbles.append(bubble)
                 
         else:
@@ -298,10 +310,10 @@ class WhimsicalVortex:
                 speed = 1
                 direction = angle + math.pi/2  # Tangential movement
                 
-                bubble = Bubble(self.canvas, x, y, size, color, speed, direction)
+                bubble = Bubble(draw, x, y, size, color, speed, direction)
                 self.bubbles.append(bubble)
     
-    def check_musical_timing(self):
+    def check_musical_timing(self, draw):
         current_time = time.time()
         if current_time - self.last_beat_time >= self.beat_interval:
             self.last_beat_time = current_time
@@ -317,7 +329,7 @@ class WhimsicalVortex:
                     speed = random.uniform(1, 2.5)
                     direction = random.uniform(0, 2 * math.pi)
                     
-                    bubble = Bubble(self.canvas, point[0], point[1], 
+                    bubble = Bubble(draw, point[0], point[1], 
                                    size, color, speed, direction)
                     self.bubbles.append(bubble)
             
@@ -330,16 +342,17 @@ class WhimsicalVortex:
                         speed = random.uniform(1.5, 3)
                         direction = random.uniform(0, 2 * math.pi)
                         
-                        bubble = Bubble(self.canvas, point[0], point[1], 
+                        bubble = Bubble(draw, point[0], point[1], 
                                        size, color, speed, direction)
                         self.bubbles.append(bubble)
     
     def animate(self):
         while self.is_running:
             self.time += 1
+            draw = self.render_queue.begin()
             
             # Check musical timing
-            self.check_musical_timing()
+            self.check_musical_timing(draw)
             
             # Occasionally create new bubbles
             if random.random() < 0.1:
@@ -351,19 +364,20 @@ class WhimsicalVortex:
                 speed = random.uniform(0.5, 2)
                 direction = random.uniform(0, 2 * math.pi)
                 
-                bubble = Bubble(self.canvas, x, y, size, color, speed, direction)
+                bubble = Bubble(draw, x, y, size, color, speed, direction)
                 self.bubbles.append(bubble)
             
             # Check for surprises
             if self.time - self.last_surprise > self.surprise_timer:
-                self.create_surprise()
+                self.create_surprise(draw)
                 self.last_surprise = self.time
                 self.surprise_timer = random.randint(500, 1500)
             
             # Update all bubbles
             for bubble in self.bubbles[:]:
-                if not bubble.update():
+                if not bubble.update(draw):
                     self.bubbles.remove(bubble)
+            self.render_queue.submit(draw)
             
             # Control framerate
             time.sleep(0.03)
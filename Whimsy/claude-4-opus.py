@@ -1,10 +1,15 @@
 import tkinter as tk
 import random
 import math
+import os
+import sys
 import time
 from threading import Thread
 import colorsys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.canvas_pool import CanvasPool
+
 class WhimsyCanvas:
     def __init__(self):
         self.root = tk.Tk()
@@ -15,6 +20,7 @@ class WhimsyCanvas:
         self.height = 600
         self.canvas = tk.Canvas(self.root, width=self.width, height=self.height, bg='#faf8f3', highlightthickness=0)
         self.canvas.pack()
+        self.pool = CanvasPool(self.canvas, layers=('trace', 'trail', 'point', 'thought', 'bubble', 'spiral'))
         
         self.thoughts = []
         self.bubbles = []
@@ -98,7 +104,7 @@ class WhimsyCanvas:
         return '#{:02x}{:02x}{:02x}'.format(int(rgb[0]*255), int(rgb[1]*255), int(rgb[2]*255))
     
     def animate(self):
-        self.canvas.delete('all')
+        self.pool.begin_frame()
         self.time_wobble += 0.05
         self.hue_drift += 0.001
         
@@ -111,11 +117,11 @@ class WhimsyCanvas:
             if trace['age'] < 30:
                 opacity = 1 - (trace['age'] / 30)
                 size = 2 + math.sin(trace['age'] * 0.3) * 2
-                self.canvas.create_oval(
+                self.pool.oval(
+                    'trace',
                     trace['x'] - size, trace['y'] - size,
                     trace['x'] + size, trace['y'] + size,
-                    fill=self.get_whimsy_color(), outline='', 
-                    tags='trace'
+                    fill=self.get_whimsy_color(), outline=''
                 )
             else:
                 self.ephemeral_traces.remove(trace)
@@ -148,23 +154,24 @@ class WhimsyCanvas:
             for i, (tx, ty) in enumerate(point['trail']):
                 fade = i / len(point['trail'])
                 size = point['radius'] * fade
-                self.canvas.create_oval(
+                self.pool.oval(
+                    'trail',
                     tx - size, ty - size,
                     tx + size, ty + size,
                     fill='', outline=self.get_whimsy_color(),
-                    width=1, tags='trail'
+                    width=1
                 )
             
             # draw point
             wobble_x = math.sin(self.time_wobble + point['phase']) * 3
             wobble_y = math.cos(self.time_wobble * 1.3 + point['phase']) * 3
-            self.canvas.create_oval(
+            self.pool.oval(
+                'point',
                 point['x'] - point['radius'] + wobble_x,
                 point['y'] - point['radius'] + wobble_y,
                 point['x'] + point['radius'] + wobble_x,
                 point['y'] + point['radius'] + wobble_y,
-                fill=self.get_whimsy_color(), outline='',
-                tags='point'
+                fill=self.get_whimsy_color(), outline=''
             )
         
         # update and draw thoughts
@@ -177,13 +184,13 @@ class WhimsyCanvas:
                 x_offset = math.sin(thought['wobble']) * 10
                 opacity = 1 - (thought['age'] / 100)
                 
-                self.canvas.create_text(
+                self.pool.text(
+                    'thought',
                     thought['x'] + x_offset,
                     thought['y'],
                     text=thought['text'],
                     font=('Arial', thought['size']),
-                    fill=thought['color'],
-                    tags='thought'
+                    fill=thought['color']
                 )
             else:
                 self.thoughts.remove(thought)
@@ -197,13 +204,14 @@ class WhimsyCanvas:
             
             if bubble['age'] < bubble['pop_time']:
                 wobble = math.sin(bubble['age'] * 0.2) * 2
-                self.canvas.create_oval(
+                self.pool.oval(
+                    'bubble',
                     bubble['x'] - bubble['size'] + wobble,
                     bubble['y'] - bubble['size'],
                     bubble['x'] + bubble['size'] + wobble,
                     bubble['y'] + bubble['size'],
                     fill='', outline=self.get_whimsy_color(),
-                    width=1, tags='bubble'
+                    width=1
                 )
             else:
                 # pop!
@@ -233,12 +241,12 @@ class WhimsyCanvas:
                         points.extend([x, y])
                 
                 if len(points) > 4:
-                    self.canvas.create_line(
+                    self.pool.line(
+                        'spiral',
                         points,
                         fill=self.get_whimsy_color(),
                         width=2,
-                        smooth=True,
-                        tags='spiral'
+                        smooth=True
                     )
             else:
                 self.spirals.remove(spiral)
@@ -257,6 +265,7 @@ class WhimsyCanvas:
                     'drift_y': math.sin(rad) * 3
                 })
         
+        self.pool.end_frame()
         self.root.after(30, self.animate)
 
 if __name__ == '__main__':
@@ -3,6 +3,7 @@ import random
 import math
 import time
 import threading
+from collections import deque
 from tkinter import Canvas
 
 class WhimsyCanvas:
@@ -16,12 +17,21 @@ class WhimsyCanvas:
         self.canvas = Canvas(self.root, bg='#0a0a0f', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
+        # The simulation thread owns these and publishes a snapshot of them after
+        # every step; the Tk main loop only ever reads the latest snapshot
         self.thoughts = []
         self.time_spiral = 0
         self.breath_cycle = 0
         self.curiosity_sparks = []
         self.wonder_trails = []
         self.playful_echoes = []
+        # New entities from the input handlers, as (list, entity) pairs for the simulation to pick up
+        self.arrivals = deque()
+        # Joy bursts from the simulation, each kept until the renderer has drawn it once
+        self.joy_bursts = deque()
+        self.snapshot = None
+        self.drawn = None
+        self.size = (800, 600)
         
         self.canvas.bind('<Motion>', self.on_mouse_move)
         self.canvas.bind('<Button-1>', self.on_click)
@@ -43,6 +53,7 @@ class WhimsyCanvas:
         self.animation_thread = threading.Thread(target=self.animate_thoughts)
         self.animation_thread.daemon = True
         self.animation_thread.start()
+        self.root.after(16, self.render_frame)
         
     def on_mouse_move(self, event):
         if random.random() < 0.3:
@@ -54,7 +65,7 @@ class WhimsyCanvas:
                 'dy': random.uniform(-2, 2),
                 'size': random.uniform(2, 8)
             }
-            self.curiosity_sparks.append(spark)
+            self.arrivals.append((self.curiosity_sparks, spark))
             
     def on_click(self, event):
         for _ in range(random.randint(5, 15)):
@@ -70,7 +81,7 @@ class WhimsyCanvas:
                 'wobble': random.uniform(0, math.pi * 2),
                 'personality': random.choice(['curious', 'dreamy', 'bouncy', 'gentle'])
             }
-            self.thoughts.append(thought)
+            self.arrivals.append((self.thoughts, thought))
             
     def on_key(self, event):
         if event.char:
@@ -83,18 +94,35 @@ class WhimsyCanvas:
                 'rotation': random.uniform(0, 360),
                 'scale': random.uniform(0.5, 2.0)
             }
-            self.playful_echoes.append(echo)
+            self.arrivals.append((self.playful_echoes, echo))
             
     def animate_thoughts(self):
         while self.running:
-            try:
-                self.update_all()
-                self.draw_all()
-                time.sleep(1/60)
-            except:
-                break
+            self.update_all()
+            # Published with a single assignment, so the renderer always sees a
+            # complete step while the next one is being built
+            self.snapshot = self.take_snapshot()
+            time.sleep(1/60)
+                
+    def render_frame(self):
+        # Runs on the Tk main loop at display rate, drawing each snapshot once
+        if self.canvas.winfo_ismapped():
+            # An unmapped canvas reports a size of 1x1
+            self.size = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot is not self.drawn:
+            bursts = []
+            while self.joy_bursts:
+                bursts.append(self.joy_bursts.popleft())
+            self.draw_all(snapshot, bursts)
+            self.drawn = snapshot
+        self.root.after(16, self.render_frame)
                 
     def update_all(self):
+        while self.arrivals:
+            entities, entity = self.arrivals.popleft()
+            entities.append(entity)
+            
         self.time_spiral += 0.05
         self.breath_cycle += 0.03
         
@@ -144,7 +172,7 @@ class WhimsyCanvas:
                 
         # Spontaneous wonder generation
         if random.random() < 0.02:
-            w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+            w, h = self.size
             trail_start = (random.uniform(0, w), random.uniform(0, h))
             trail = []
             
@@ -163,79 +191,98 @@ class WhimsyCanvas:
             if trail['age'] > 200:
                 self.wonder_trails.remove(trail)
                 
-    def draw_all(self):
+        # Spontaneous joy bursts, shown in the next frame drawn
+        if random.random() < 0.005:
+            w, h = self.size
+            for _ in range(random.randint(3, 8)):
+                self.joy_bursts.append((random.uniform(0, w), random.uniform(0, h),
+                                        random.choice(['✦', '◦', '⋆', '○', '●']),
+                                        random.choice(list(self.colors.values())),
+                                        random.randint(8, 20)))
+                
+    def take_snapshot(self):
+        # Copies of just what draw_all needs; trail points are never changed once made
+        return {
+            'breath_cycle': self.breath_cycle,
+            'time_spiral': self.time_spiral,
+            'wonder_trails': [(trail['age'], trail['points']) for trail in self.wonder_trails],
+            'thoughts': [(thought['x'], thought['y'], thought['wobble'], thought['age'], thought['max_age'],
+                          thought['size'], thought['color']) for thought in self.thoughts],
+            'curiosity_sparks': [(spark['x'], spark['y'], spark['age'], spark['size'])
+                                 for spark in self.curiosity_sparks],
+            'playful_echoes': [(echo['x'], echo['y'], echo['char'], echo['age'], echo['scale'])
+                               for echo in self.playful_echoes],
+        }
+                
+    def draw_all(self, snapshot, joy_bursts):
         self.canvas.delete('all')
-        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        w, h = self.size
         
         # Background breathing pattern
-        breath_intensity = (math.sin(self.breath_cycle) + 1) / 2
+        breath_intensity = (math.sin(snapshot['breath_cycle']) + 1) / 2
         bg_color = f"#{int(10 + breath_intensity * 5):02x}{int(10 + breath_intensity * 5):02x}{int(15 + breath_intensity * 10):02x}"
         self.canvas.configure(bg=bg_color)
         
         # Draw time spiral (the constant wondering)
+        time_spiral = snapshot['time_spiral']
         center_x, center_y = w//2, h//2
         for i in range(0, 360, 5):
-            angle = math.radians(i + self.time_spiral * 10)
-            radius = 50 + math.sin(self.time_spiral + i * 0.1) * 20
+            angle = math.radians(i + time_spiral * 10)
+            radius = 50 + math.sin(time_spiral + i * 0.1) * 20
             x = center_x + math.cos(angle) * radius
             y = center_y + math.sin(angle) * radius
-            size = 2 + math.sin(i * 0.2 + self.time_spiral) * 1
+            size = 2 + math.sin(i * 0.2 + time_spiral) * 1
             
             self.canvas.create_oval(x-size, y-size, x+size, y+size,
                                   fill=self.colors['glow'], outline='')
                                   
         # Draw wonder trails
-        for trail in self.wonder_trails:
-            alpha = 1 - trail['age'] / 200
-            for i, (x, y, size) in enumerate(trail['points']):
+        for age, points in snapshot['wonder_trails']:
+            alpha = 1 - age / 200
+            for i, (x, y, size) in enumerate(points):
                 if 0 <= x <= w and 0 <= y <= h:
-                    point_alpha = alpha * (1 - i / len(trail['points']))
+                    point_alpha = alpha * (1 - i / len(points))
                     if point_alpha > 0.1:
                         self.canvas.create_oval(x-size, y-size, x+size, y+size,
                                               fill=self.colors['wonder'], outline='')
                                               
         # Draw thoughts
-        for thought in self.thoughts:
-            if 0 <= thought['x'] <= w and 0 <= thought['y'] <= h:
-                alpha = 1 - thought['age'] / thought['max_age']
-                size = thought['size'] * alpha
+        for x, y, wobble, age, max_age, size, color in snapshot['thoughts']:
+            if 0 <= x <= w and 0 <= y <= h:
+                alpha = 1 - age / max_age
+                size = size * alpha
                 
                 # Add whimsical wobble visualization
-                wobble_x = thought['x'] + math.sin(thought['wobble']) * 3
-                wobble_y = thought['y'] + math.cos(thought['wobble']) * 2
+                wobble_x = x + math.sin(wobble) * 3
+                wobble_y = y + math.cos(wobble) * 2
                 
                 self.canvas.create_oval(wobble_x-size, wobble_y-size, 
                                       wobble_x+size, wobble_y+size,
-                                      fill=thought['color'], outline='')
+                                      fill=color, outline='')
                                       
         # Draw curiosity sparks
-        for spark in self.curiosity_sparks:
-            if 0 <= spark['x'] <= w and 0 <= spark['y'] <= h:
-                alpha = 1 - spark['age'] / 60
-                size = spark['size'] * alpha
-                self.canvas.create_oval(spark['x']-size, spark['y']-size,
-                                      spark['x']+size, spark['y']+size,
+        for x, y, age, size in snapshot['curiosity_sparks']:
+            if 0 <= x <= w and 0 <= y <= h:
+                alpha = 1 - age / 60
+                size = size * alpha
+                self.canvas.create_oval(x-size, y-size,
+                                      x+size, y+size,
                                       fill=self.colors['spark'], outline='')
                                       
         # Draw playful echoes
-        for echo in self.playful_echoes:
-            alpha = 1 - echo['age'] / 120
+        for x, y, char, age, scale in snapshot['playful_echoes']:
+            alpha = 1 - age / 120
             if alpha > 0.1:
                 try:
-                    self.canvas.create_text(echo['x'], echo['y'], text=echo['char'],
+                    self.canvas.create_text(x, y, text=char,
                                           fill=self.colors['play'], 
-                                          font=('Courier', int(16 * echo['scale'])))
-                except:
+                                          font=('Courier', int(16 * scale)))
+                except tk.TclError:
                     pass
                     
         # Spontaneous joy bursts
-        if random.random() < 0.005:
-            for _ in range(random.randint(3, 8)):
-                x = random.uniform(0, w)
-                y = random.uniform(0, h)
-                self.canvas.create_text(x, y, text=random.choice(['✦', '◦', '⋆', '○', '●']),
-                                      fill=random.choice(list(self.colors.values())),
-                                      font=('Arial', random.randint(8, 20)))
+        for x, y, char, color, font_size in joy_bursts:
+            self.canvas.create_text(x, y, text=char, fill=color, font=('Arial', font_size))
                                       
     def run(self):
         try:
@@ -1,10 +1,14 @@
 # emotion.py
 
+import os
+import sys
 import tkinter as tk
 import random
-import colorsys
 import math
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.palette import HLS
+
 # A canvas for the dance of whimsy.
 root = tk.Tk()
 root.title("Whimsy's Echo")
@@ -27,16 +31,13 @@ current_hue = random.random()
 whimsy_level_factor = 1.0 # Influences size and speed.
 color_shift_magnitude = 0.01 # How quickly colors evolve.
 
-def _rgb_to_hex(r, g, b):
-    # Internal conversion for color representation.
-    return f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
+def _get_whimsy_hue(base_hue):
+    # A slight random variation on a hue, as whimsy isn't perfectly consistent.
+    return (base_hue + (random.random() - 0.5) * 0.05) % 1.0
 
-def _get_whimsy_color(base_hue, saturation=0.8, lightness=0.7):
-    # Generates a color, but with a slight random variation,
-    # as whimsy isn't perfectly consistent.
-    h = (base_hue + (random.random() - 0.5) * 0.05) % 1.0
-    r, g, b = colorsys.hls_to_rgb(h, lightness, saturation)
-    return _rgb_to_hex(r, g, b)
+def _get_whimsy_color(hue, saturation=0.8, lightness=0.7):
+    # Internal conversion for color representation, from the shared lookup table.
+    return HLS.hex(hue, lightness, saturation)
 
 def _create_whimsy_particle_data():
     # A new manifestation of whimsy emerges.
@@ -45,9 +46,10 @@ def _create_whimsy_particle_data():
     size = random.uniform(5, 20) * whimsy_level_factor
     vx = random.uniform(-2, 2) * whimsy_level_factor
     vy = random.uniform(-2, 2) * whimsy_level_factor
-    color = _get_whimsy_color(current_hue)
+    hue = _get_whimsy_hue(current_hue)
+    color = _get_whimsy_color(hue)
     shape_type = random.choice(["circle", "square", "triangle"]) # The form it takes.
-    return {"x": x, "y": y, "size": size, "vx": vx, "vy": vy, "color": color, "shape_type": shape_type, "id": None}
+    return {"x": x, "y": y, "size": size, "vx": vx, "vy": vy, "hue": hue, "color": color, "shape_type": shape_type, "id": None}
 
 def _draw_particle(particle_data):
     # Visualizing the conceptual particle.
@@ -91,12 +93,14 @@ def _update_whimsy_state():
             else: # Sometimes it reflects, but unpredictably.
                 p["vx"] *= -1
                 p["vy"] *= -1
-            p["color"] = _get_whimsy_color(current_hue) # Color shifts upon 'event'.
+            p["hue"] = _get_whimsy_hue(current_hue) # Color shifts upon 'event'.
+            p["color"] = _get_whimsy_color(p["hue"])
         
         # Color evolution for each particle.
         # This is a constant, subtle internal flicker.
-        current_p_hue = colorsys.rgb_to_hls(*[int(c, 16)/255 for c in (p["color"][1:3], p["color"][3:5], p["color"][5:7])])[0]
-        p["color"] = _get_whimsy_color(current_p_hue)
+        # The hue is kept on the particle rather than read back out of its hex color.
+        p["hue"] = _get_whimsy_hue(p["hue"])
+        p["color"] = _get_whimsy_color(p["hue"])
 
         # Update visual on canvas.
         if p["id"]:
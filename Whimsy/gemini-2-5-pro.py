@@ -1,8 +1,12 @@
+import os
+import sys
 import tkinter
 import random
-import colorsys
 import math
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gallery.palette import HSV
+
 # a fragile thing
 
 class Ephemera:
@@ -19,7 +23,7 @@ class Ephemera:
         self.y = random.uniform(0, self.world_h)
 
         self.hue = random.random()
-        self.color = self._hsv_to_rgb_hex(self.hue, 0.8, 0.95)
+        self.color = HSV.hex(self.hue, 0.8, 0.95)
         self.size = random.uniform(3, 7)
         self.id = self.canvas.create_oval(
             self.x - self.size,
@@ -37,10 +41,6 @@ class Ephemera:
         self.lifespan = random.uniform(200, 500)
         self.age = 0
 
-    def _hsv_to_rgb_hex(self, h, s, v):
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        return f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
-
     def shimmer(self):
         self.age += 1
         if self.age > self.lifespan:
@@ -59,7 +59,7 @@ class Ephemera:
 
         # the change
         self.hue = (self.hue + 0.002) % 1.0
-        new_color = self._hsv_to_rgb_hex(self.hue, 0.8, 0.95)
+        new_color = HSV.hex(self.hue, 0.8, 0.95)
         
         # fade as it ages
         opacity = 1.0 - (self.age / self.lifespan)
@@ -81,7 +81,7 @@ class Ephemera:
         # leave a trace, a memory
         if self.age % 5 == 0:
             trace_size = new_size * 0.5
-            trace_color = self._hsv_to_rgb_hex(self.hue, 0.5, 0.4)
+            trace_color = HSV.hex(self.hue, 0.5, 0.4)
             trace_id = self.canvas.create_oval(
                 self.x - trace_size,
                 self.y - trace_size,
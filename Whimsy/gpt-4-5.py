@@ -2,13 +2,22 @@ import pygame
 import random
 import math
 import sys
+import numpy as np
+from collections import OrderedDict
 
 pygame.init()
 
 screen = pygame.display.set_mode((800, 600))
 clock = pygame.time.Clock()
 
-def swirl(surface, t):
+# swirl map ring: phases per 2*pi period, how many maps to keep, and whether to blend neighbours.
+# t moves 0.03 a frame and phases are 2*pi/64 (about 0.1) apart, so blending is what keeps the
+# swirl moving every frame; the frames walk through the ring in order, so a few maps are enough
+SWIRL_PHASES = 64
+SWIRL_CACHE_SIZE = 4
+SWIRL_INTERPOLATE = True
+
+def swirl_reference(surface, t):
     width, height = surface.get_size()
     new_surface = pygame.Surface((width, height))
     for y in range(height):
@@ -20,21 +29,173 @@ def swirl(surface, t):
                 new_surface.set_at((x, y), surface.get_at((dx, dy)))
     return new_surface
 
+swirl_grids = {}
+
+def swirl_grid(width, height):
+    # the parts of the displacement field that never change with t
+    grid = swirl_grids.get((width, height))
+    if grid is None:
+        xs = np.arange(width, dtype=np.float64)
+        ys = np.arange(height, dtype=np.float64)
+        grid = (xs[:, None], ys[None, :], (xs - width/2)/40.0, (ys - height/2)/40.0)
+        swirl_grids[(width, height)] = grid
+    return grid
+
+def swirl(surface, t, out=None):
+    width, height = surface.get_size()
+    if out is None:
+        out = pygame.Surface((width, height), surface.get_flags(), surface)
+    xs, ys, x_phase, y_phase = swirl_grid(width, height)
+
+    # surfarray is indexed [x, y]
+    angle = np.sin(t + x_phase)[:, None] + np.cos(t + y_phase)[None, :]
+    dx = (xs + 10 * np.cos(angle)).astype(np.intp)
+    dy = (ys + 10 * np.sin(angle)).astype(np.intp)
+    outside = (dx < 0) | (dx >= width) | (dy < 0) | (dy >= height)
+    np.clip(dx, 0, width - 1, out=dx)
+    np.clip(dy, 0, height - 1, out=dy)
+
+    # one gather over the packed pixels; everything comes out opaque, like a plain surface would
+    opaque = surface.get_masks()[3]
+    src = pygame.surfarray.pixels2d(surface)
+    remapped = src[dx, dy] | opaque
+    del src
+    remapped[outside] = opaque
+    pygame.surfarray.blit_array(out, remapped)
+    return out
+
+class SwirlEngine:
+    # The displacement only depends on t through sin(t + x/40) and cos(t + y/40), so it repeats
+    # every 2*pi. A ring of `phases` maps covers one period; at most `cache_size` of them are kept.
+    # Nearest-phase maps are a flat int32 gather index (4 bytes/pixel); with `interpolate` each map
+    # keeps float32 source x/y coordinates instead (8 bytes/pixel) and neighbouring phases are
+    # blended per frame, in place, into preallocated buffers.
+    def __init__(self, width, height, phases=64, cache_size=4, interpolate=True):
+        self.width, self.height = width, height
+        self.phases = phases
+        self.cache_size = cache_size
+        self.interpolate = interpolate
+        self.maps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.pixels = np.empty(width * height + 1, dtype=np.uint32)
+        self.xs, self.ys, self.x_phase, self.y_phase = swirl_grid(width, height)
+        self.flat_x = np.arange(width, dtype=np.int32)[:, None] * height
+        self.flat_y = np.arange(height, dtype=np.int32)[None, :]
+        if interpolate:
+            self.blend_x = np.empty((width, height), dtype=np.float32)
+            self.blend_y = np.empty((width, height), dtype=np.float32)
+            self.source_x = np.empty((width, height), dtype=np.int32)
+            self.source_y = np.empty((width, height), dtype=np.int32)
+            self.outside = np.empty((width, height), dtype=bool)
+
+    def displacement(self, k):
+        angle = np.sin(2 * math.pi * k / self.phases + self.x_phase)[:, None] + np.cos(2 * math.pi * k / self.phases + self.y_phase)[None, :]
+        return 10 * np.cos(angle), 10 * np.sin(angle)
+
+    def gather_index(self, ox, oy):
+        # flat index into the source pixels; the extra last slot is opaque black for anything off-surface
+        dx = (self.xs + ox).astype(np.int32)
+        dy = (self.ys + oy).astype(np.int32)
+        index = dx * self.height + dy
+        index[(dx < 0) | (dx >= self.width) | (dy < 0) | (dy >= self.height)] = self.width * self.height
+        return index
+
+    def phase_map(self, k):
+        k %= self.phases
+        entry = self.maps.get(k)
+        if entry is not None:
+            self.hits += 1
+            self.maps.move_to_end(k)
+            return entry
+        self.misses += 1
+        ox, oy = self.displacement(k)
+        if self.interpolate:
+            entry = ((self.xs + ox).astype(np.float32), (self.ys + oy).astype(np.float32))
+        else:
+            entry = self.gather_index(ox, oy)
+        self.maps[k] = entry
+        if len(self.maps) > self.cache_size:
+            self.maps.popitem(last=False)
+        return entry
+
+    def index_at(self, t):
+        position = (t % (2 * math.pi)) / (2 * math.pi) * self.phases
+        k = int(position)
+        if not self.interpolate:
+            return self.phase_map(k if position - k < 0.5 else k + 1)
+        w = position - k
+        x0, y0 = self.phase_map(k)
+        x1, y1 = self.phase_map(k + 1)
+        return self.blended_index(x0, x1, y0, y1, w)
+
+    def blended_index(self, x0, x1, y0, y1, w):
+        # the same index as gather_index, for source coordinates blended w of the way from phase 0 to 1
+        np.subtract(x1, x0, out=self.blend_x)
+        self.blend_x *= w
+        self.blend_x += x0
+        np.subtract(y1, y0, out=self.blend_y)
+        self.blend_y *= w
+        self.blend_y += y0
+        self.source_x[...] = self.blend_x
+        self.source_y[...] = self.blend_y
+        # negative coordinates wrap round to huge unsigned ones, so one comparison per axis is enough
+        np.greater_equal(self.source_x.view(np.uint32), self.width, out=self.outside)
+        self.outside |= self.source_y.view(np.uint32) >= self.height
+        self.source_x *= self.height
+        self.source_x += self.source_y
+        self.source_x[self.outside] = self.width * self.height
+        return self.source_x
+
+    def swirl(self, surface, t, out):
+        index = self.index_at(t)
+        opaque = surface.get_masks()[3]
+        self.pixels[:-1].reshape(self.width, self.height)[...] = pygame.surfarray.pixels2d(surface)
+        self.pixels[:-1] |= opaque
+        self.pixels[-1] = opaque
+        pygame.surfarray.blit_array(out, self.pixels.take(index))
+        return out
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+def verify_swirl(width=800, height=600, frames=(0.0, 0.03, 1.7, 12.345)):
+    # the vectorized swirl must match the per-pixel original exactly
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    for _ in range(500):
+        pygame.draw.circle(surface, random.choice(colors), (random.randint(0, width), random.randint(0, height)), random.randint(1, 3))
+    for t in frames:
+        expected = pygame.surfarray.array3d(swirl_reference(surface, t))
+        actual = pygame.surfarray.array3d(swirl(surface, t))
+        if not np.array_equal(expected, actual):
+            print(f"swirl mismatch at t={t}: {np.count_nonzero((expected != actual).any(axis=2))} pixels differ")
+            return False
+    print("swirl matches the reference bit-for-bit")
+    return True
+
 colors = [(240, 128, 128), (135, 206, 235), (255, 218, 185), (221, 160, 221), (144, 238, 144), (255, 239, 213)]
 particles = []
 
+if '--verify' in sys.argv:
+    ok = verify_swirl()
+    pygame.quit()
+    sys.exit(0 if ok else 1)
+
 for _ in range(500):
     particles.append([random.randint(0, 800), random.randint(0, 600), random.choice(colors), random.uniform(0.5, 3)])
 
 running = True
 t = 0
+surface = pygame.Surface((800, 600), pygame.SRCALPHA)
+swirled = pygame.Surface((800, 600), pygame.SRCALPHA)
+engine = SwirlEngine(800, 600, phases=SWIRL_PHASES, cache_size=SWIRL_CACHE_SIZE, interpolate=SWIRL_INTERPOLATE)
 
 while running:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
 
-    surface = pygame.Surface((800, 600), pygame.SRCALPHA)
     surface.fill((0, 0, 0, 0))
 
     for p in particles:
@@ -44,12 +205,13 @@ while running:
         p[0] %= 800
         p[1] %= 600
 
-    swirled = swirl(surface, t)
+    engine.swirl(surface, t, swirled)
     screen.blit(swirled, (0, 0))
 
     pygame.display.flip()
     clock.tick(60)
     t += 0.03
 
+print(f"swirl map cache hit rate: {engine.hit_rate():.1%} ({engine.hits} hits, {engine.misses} misses)")
 pygame.quit()
 sys.exit()
@@ -0,0 +1 @@
+"""Shared helpers for running and rendering the pieces in this gallery."""
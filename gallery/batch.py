@@ -0,0 +1,229 @@
+"""Render the whole gallery in parallel, one piece per worker process.
+
+Every non-empty ``*.py`` under the emotion folders is discovered and sorted by
+what it draws with. Each pygame and tkinter/turtle piece then runs in a fresh
+process from a ``ProcessPoolExecutor``:
+
+- pygame pieces go through ``gallery.headless`` on the SDL dummy driver.
+- tkinter pieces go through ``gallery.simclock``. If ``Xvfb`` is installed,
+  each one gets its own virtual X display, and frames are grabbed from it.
+
+Workers are spawned rather than forked and serve one piece each, so no SDL,
+Tk or module state carries over from one piece to the next. Pieces that use
+other front ends (Flask, curses, matplotlib) are listed as skipped.
+
+For each piece the report gives the frames written, the simulated frames per
+second and the worker's peak resident memory. The command exits with status 1
+if any piece that was not skipped failed to render.
+
+Usage::
+
+    python3 -m gallery.batch --frames 1800 --format mp4 --out clips/
+    python3 -m gallery.batch Remorse Whimsy/gpt-4-1.py --frames 300 --format none --workers 8 --json report.json
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import glob
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def emotion_folders(root=ROOT):
+    """Top-level folders holding pieces, e.g. ``Remorse``; ``_template_`` and ``gallery`` are not emotions."""
+    return sorted(name for name in os.listdir(root)
+                  if name[:1].isupper() and os.path.isdir(os.path.join(root, name)))
+
+
+def discover(targets=(), root=ROOT):
+    """Paths of the pieces named by ``targets`` (folders or files), or of every piece."""
+    targets = list(targets) or [os.path.join(root, name) for name in emotion_folders(root)]
+    pieces = []
+    for target in targets:
+        if os.path.isdir(target):
+            pieces.extend(sorted(glob.glob(os.path.join(target, '*.py'))))
+        else:
+            pieces.append(target)
+    return [os.path.relpath(path, root) for path in pieces if os.path.getsize(path) > 0]
+
+
+def piece_kind(path):
+    with open(path, encoding='utf-8') as source_file:
+        source = source_file.read()
+    if re.search(r'^\s*(import|from)\s+pygame\b', source, re.M):
+        return 'pygame'
+    if re.search(r'^\s*(import|from)\s+(tkinter|turtle)\b', source, re.M):
+        return 'tk'
+    if re.search(r'^\s*(import|from)\s+matplotlib\b', source, re.M):
+        return 'matplotlib'
+    return None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def output_path(piece, out, file_format):
+    name = os.path.splitext(piece)[0]
+    if file_format == 'mp4':
+        name += '.mp4'
+    return os.path.join(out, name)
+
+
+def start_xvfb():
+    """Start a private X server for this worker and point ``DISPLAY`` at it."""
+    read, write = os.pipe()
+    process = subprocess.Popen(['Xvfb', '-displayfd', str(write), '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
+                               pass_fds=(write,), stderr=subprocess.DEVNULL)
+    os.close(write)
+    with os.fdopen(read) as pipe:
+        os.environ['DISPLAY'] = ':' + pipe.readline().strip()
+    return process
+
+
+def grab_frames(directory):
+    """``on_frame`` callback that saves the piece's window as numbered PNGs."""
+    from PIL import ImageGrab
+
+    os.makedirs(directory, exist_ok=True)
+
+    def on_frame(widget, frame):
+        window = widget.winfo_toplevel()
+        x, y = window.winfo_rootx(), window.winfo_rooty()
+        image = ImageGrab.grab(bbox=(x, y, x + window.winfo_width(), y + window.winfo_height()))
+        image.save(os.path.join(directory, f'frame_{frame:06d}.png'))
+    return on_frame
+
+
+def encode_frames(directory, path, fps):
+    subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-framerate', str(fps),
+                    '-pattern_type', 'glob', '-i', os.path.join(directory, 'frame_*.png'),
+                    '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path], check=True)
+    shutil.rmtree(directory)
+
+
+def render_pygame(job):
+    from gallery import headless
+
+    sink = headless.make_sink(job['format'], job['out'], job['fps'])
+    stats = headless.render(job['path'], frames=job['frames'], fps=job['fps'], sink=sink,
+                            seed=job['seed'], skip=job['skip'])
+    return stats['frames'], stats['seconds'], stats['fps']
+
+
+def render_tk(job):
+    from gallery import simclock
+
+    xvfb = start_xvfb() if shutil.which('Xvfb') else None
+    directory = None
+    if job['format'] == 'png':
+        directory = job['out']
+    elif job['format'] == 'mp4':
+        directory = job['out'] + '.frames'
+    try:
+        stats = simclock.simulate(job['path'], seconds=job['frames'] / job['fps'], fps=job['fps'],
+                                  seed=job['seed'], skip=job['skip'] / job['fps'],
+                                  on_frame=grab_frames(directory) if directory else None)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+    if job['format'] == 'mp4':
+        encode_frames(directory, job['out'], job['fps'])
+    frames = max(0, stats['frames'] - job['skip'])
+    return frames, stats['seconds'], stats['frames'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+
+
+def render_job(job):
+    """Worker entry point: render one piece and report how it went."""
+    result = {'piece': job['piece'], 'kind': job['kind'], 'frames': 0, 'seconds': 0.0, 'fps': 0.0, 'status': 'ok'}
+    if job['format'] != 'none':
+        os.makedirs(os.path.dirname(job['out']), exist_ok=True)
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            render = render_pygame if job['kind'] == 'pygame' else render_tk
+            result['frames'], result['seconds'], result['fps'] = render(job)
+    except Exception as error:
+        result['status'] = f'{type(error).__name__}: {error}'
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def render_gallery(pieces, out='renders', file_format='mp4', frames=600, fps=60.0, seed=0, skip=0, workers=None):
+    """Render ``pieces`` across a process pool and return one result dict per piece."""
+    results = []
+    jobs = []
+    for piece in pieces:
+        kind = piece_kind(os.path.join(ROOT, piece))
+        if kind in (None, 'matplotlib'):
+            results.append({'piece': piece, 'kind': kind, 'frames': 0, 'seconds': 0.0, 'fps': 0.0,
+                            'peak_rss_mb': None, 'status': 'skipped'})
+            print(format_result(results[-1]), file=sys.stderr)
+            continue
+        jobs.append({'piece': piece, 'path': os.path.join(ROOT, piece), 'kind': kind,
+                     'out': output_path(piece, out, file_format), 'format': file_format,
+                     'frames': frames, 'fps': fps, 'seed': seed, 'skip': skip})
+
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                max_tasks_per_child=1) as pool:
+        futures = [pool.submit(render_job, job) for job in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            print(format_result(result), file=sys.stderr)
+            results.append(result)
+    return sorted(results, key=lambda result: result['piece'])
+
+
+def format_result(result):
+    rss = '-' if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.0f}"
+    return (f"{result['piece']:<40} {result['kind'] or '-':<7} {result['frames']:>6} "
+            f"{result['fps']:>8.1f} {rss:>8}  {result['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('targets', nargs='*', help='emotion folders or piece files (default: the whole gallery)')
+    parser.add_argument('--frames', type=int, default=600, help='frames to write per piece')
+    parser.add_argument('--fps', type=float, default=60.0, help='simulated frames per second')
+    parser.add_argument('--seed', type=int, default=0, help='seed for random and numpy.random')
+    parser.add_argument('--skip', type=int, default=0, help='frames to fast-forward through before writing')
+    parser.add_argument('--format', choices=('png', 'mp4', 'none'), default='mp4',
+                        help='a png folder or an ffmpeg video per piece, or nothing')
+    parser.add_argument('--out', default='renders', help='output folder, mirroring the gallery layout')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    pieces = discover(args.targets)
+    print(f"{'piece':<40} {'kind':<7} {'frames':>6} {'fps':>8} {'rss MB':>8}  status", file=sys.stderr)
+    results = render_gallery(pieces, out=args.out, file_format=args.format, frames=args.frames, fps=args.fps,
+                             seed=args.seed, skip=args.skip, workers=args.workers)
+    rendered = [result for result in results if result['status'] == 'ok']
+    print(f'{len(rendered)} of {len(results)} pieces rendered', file=sys.stderr)
+
+    if args.json:
+        with open(args.json, 'w') as report:
+            json.dump(results, report, indent=2)
+
+    if any(result['status'] not in ('ok', 'skipped') for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+"""Frame-time and memory benchmarks for every piece, with baseline comparison.
+
+Each piece is run twice on a seeded ``gallery.simclock`` timeline, so both
+passes see exactly the same workload. Each pass runs in a fresh process.
+
+- The timing pass records how long each frame takes, and how much of it is
+  spent in the piece's update-like and draw-like functions. On the first frame
+  the module-level functions and class methods defined by the piece are
+  wrapped by name: ``draw``/``render``/``paint``/``display``/``show``/``blit``
+  count as draw, and ``update``/``step``/``move``/``evolve``/``advance``/
+  ``simulate``/``physics``/``spawn`` count as update. Time is charged to the
+  innermost wrapped call, and whatever is left over in the frame (the main
+  loop body, ``flip``, tkinter's redraw) is reported as other.
+- The memory pass runs under ``tracemalloc``. It records the bytes allocated
+  within each frame (the traced peak over the frame's starting point) and the
+  net growth. Live objects are counted before and after the measured frames.
+
+Each pass stops after ten times the simulated time its frames should take
+at ``--fps`` (at least a minute), for pieces that never reach a frame, e.g.
+ones that loop on ``time.sleep`` instead of a main loop. Such a pass is
+reported as timed out.
+
+The first ``--warmup`` frames are not measured. For tkinter pieces, frames
+in which no timer or thread ran are not counted either. matplotlib pieces are
+drawn offscreen with the Agg backend, their ``FuncAnimation`` timers on the
+simulated clock, and are measured like tkinter pieces. Pieces with other front
+ends (Flask, curses) are reported as skipped.
+
+Usage::
+
+    python3 -m gallery.bench --frames 600 --out bench.json
+    python3 -m gallery.bench Whimsy Invigorated/gemini-2-5-flash.py --baseline bench.json --threshold 10
+"""
+import argparse
+import collections
+import concurrent.futures
+import functools
+import gc
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from gallery.batch import ROOT, discover, piece_kind
+
+_perf_counter = time.perf_counter
+
+PHASE_WORDS = (
+    ('draw', ('draw', 'render', 'paint', 'display', 'show', 'blit')),
+    ('update', ('update', 'step', 'move', 'evolve', 'advance', 'simulate', 'physics', 'spawn')),
+)
+
+
+def phase_of(name):
+    name = name.lower()
+    for phase, words in PHASE_WORDS:
+        if any(word in name for word in words):
+            return phase
+    return None
+
+
+def percentiles(values):
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f'p{q}': ordered[round(q / 100 * last)] for q in (50, 95, 99)}
+
+
+class PhaseTimer:
+    """Exclusive time spent in wrapped update and draw functions on the main thread."""
+
+    def __init__(self):
+        self.totals = {'update': 0.0, 'draw': 0.0}
+        self.stack = []
+        self.mark = 0.0
+        self.main_thread = threading.main_thread()
+
+    def enter(self, phase):
+        now = _perf_counter()
+        if self.stack:
+            self.totals[self.stack[-1]] += now - self.mark
+        self.stack.append(phase)
+        self.mark = now
+
+    def exit(self):
+        now = _perf_counter()
+        self.totals[self.stack.pop()] += now - self.mark
+        self.mark = now
+
+    def take(self):
+        totals = self.totals
+        self.totals = {'update': 0.0, 'draw': 0.0}
+        return totals
+
+    def wrap(self, function, phase):
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            # Background threads interleave with the main thread at every sleep,
+            # which would scramble the stack, so only the main thread is timed
+            if threading.current_thread() is not self.main_thread:
+                return function(*args, **kwargs)
+            self.enter(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.exit()
+        return timed
+
+    def instrument(self, namespace, path):
+        """Wrap the functions and methods that the piece at ``path`` defines in ``namespace``."""
+        def defined_here(value):
+            return inspect.isfunction(value) and value.__code__.co_filename == path
+
+        for name, value in list(namespace.items()):
+            if defined_here(value) and phase_of(name):
+                namespace[name] = self.wrap(value, phase_of(name))
+            elif inspect.isclass(value):
+                for attribute, member in list(vars(value).items()):
+                    if defined_here(member) and phase_of(attribute):
+                        setattr(value, attribute, self.wrap(member, phase_of(attribute)))
+
+
+def piece_globals(path):
+    """The module namespace of the running piece, found on the current call stack."""
+    frame = sys._getframe()
+    while frame is not None:
+        if frame.f_code.co_filename == path:
+            return frame.f_globals
+        frame = frame.f_back
+    return {}
+
+
+def type_counts():
+    gc.collect()
+    return collections.Counter(type(value).__name__ for value in gc.get_objects())
+
+
+def measure(job):
+    """Worker entry point: one timing or memory pass over one piece."""
+    from gallery import simclock
+
+    path, frames, warmup, memory = job['path'], job['frames'], job['warmup'], job['pass'] == 'memory'
+    samples = collections.defaultdict(list)
+    timer = PhaseTimer()
+    # tkinter timers may run slower than the frame rate, hence the generous limit
+    until = max(60.0, (warmup + frames) / job['fps'] * 10)
+    clock = simclock.SimClock(job['fps'], seed=job['seed'], until=until)
+    state = {'index': 0, 'last': None, 'dispatched': 0, 'memory': 0, 'objects': None, 'done': False}
+    result = {'piece': job['piece'], 'pass': job['pass'], 'status': 'ok'}
+
+    def on_frame(*_):
+        now = _perf_counter()
+        index = state['index']
+        if index == 0:
+            timer.instrument(piece_globals(path), path)
+        if job['kind'] != 'pygame':
+            if clock.dispatched == state['dispatched']:
+                return
+            state['dispatched'] = clock.dispatched
+        state['index'] += 1
+
+        if index == warmup:
+            if memory:
+                state['objects'] = type_counts()
+                tracemalloc.start()
+                state['memory'] = tracemalloc.get_traced_memory()[0]
+            timer.take()
+        elif index > warmup:
+            phases = timer.take()
+            frame = now - state['last']
+            samples['frame'].append(frame * 1000)
+            samples['update'].append(phases['update'] * 1000)
+            samples['draw'].append(phases['draw'] * 1000)
+            samples['other'].append((frame - phases['update'] - phases['draw']) * 1000)
+            if memory:
+                current, peak = tracemalloc.get_traced_memory()
+                samples['alloc'].append((peak - state['memory']) / 1024)
+                samples['net'].append((current - state['memory']) / 1024)
+                tracemalloc.reset_peak()
+                state['memory'] = current
+        if index >= warmup + frames:
+            if memory:
+                # Counted here, while the piece is still running and holding its objects
+                tracemalloc.stop()
+                state['after'] = type_counts()
+            state['done'] = True
+            raise simclock.RenderComplete
+        state['last'] = _perf_counter()
+
+    try:
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull
+            if job['kind'] == 'pygame':
+                from gallery import headless
+                headless.render(path, frames=sys.maxsize, clock=clock, on_frame=on_frame)
+            else:
+                simclock.run(path, clock, simclock._Patch(), on_frame=on_frame,
+                             figures=job['kind'] == 'matplotlib')
+    except Exception as error:
+        result['status'] = f'{type(error).__name__}: {error}'
+    finally:
+        sys.stdout = sys.__stdout__
+    if result['status'] == 'ok' and not state['done']:
+        if clock.elapsed() >= until:
+            result['status'] = f"timed out after {until:.0f} simulated seconds, {state['index']} frames"
+        else:
+            result['status'] = f"stopped after {state['index']} frames"
+
+    result['frames'] = len(samples['frame'])
+    if memory:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if state['objects'] is not None and 'after' in state:
+            after = state['after']
+            growth = after - state['objects']
+            result['objects'] = sum(after.values())
+            result['object_growth'] = sum(after.values()) - sum(state['objects'].values())
+            result['top_growth'] = growth.most_common(5)
+        result['alloc_kb'] = percentiles(samples['alloc'])
+        result['net_kb_per_frame'] = sum(samples['net']) / len(samples['net']) if samples['net'] else 0.0
+    else:
+        for phase in ('frame', 'update', 'draw', 'other'):
+            result[f'{phase}_ms'] = percentiles(samples[phase])
+    return result
+
+
+def run_benchmarks(pieces, frames=300, warmup=60, fps=60.0, seed=0, workers=1):
+    """Benchmark ``pieces`` and return one merged result dict per piece, keyed by piece."""
+    results = {}
+    jobs = []
+    for piece in pieces:
+        kind = piece_kind(os.path.join(ROOT, piece))
+        results[piece] = {'piece': piece, 'kind': kind, 'status': 'ok' if kind else 'skipped'}
+        if kind is None:
+            print(format_result(results[piece]), file=sys.stderr)
+            continue
+        for bench_pass in ('time', 'memory'):
+            jobs.append({'piece': piece, 'path': os.path.join(ROOT, piece), 'kind': kind, 'pass': bench_pass,
+                         'frames': frames, 'warmup': warmup, 'fps': fps, 'seed': seed})
+
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                max_tasks_per_child=1) as pool:
+        for result in pool.map(measure, jobs):
+            merged = results[result['piece']]
+            if result['status'] != 'ok':
+                merged['status'] = result['status']
+            merged.update({key: value for key, value in result.items() if key not in ('pass', 'status')})
+            if result['pass'] == 'memory':
+                print(format_result(merged), file=sys.stderr)
+    return results
+
+
+def format_result(result):
+    if 'frame_ms' not in result:
+        return f"{result['piece']:<40} {result['status']}"
+    frame, alloc = result['frame_ms'], result.get('alloc_kb', {})
+    return (f"{result['piece']:<40} {frame['p50']:>7.2f} {frame['p95']:>7.2f} {frame['p99']:>7.2f} "
+            f"{result['update_ms']['p50']:>7.2f} {result['draw_ms']['p50']:>7.2f} "
+            f"{alloc.get('p50', 0.0):>9.1f} {result.get('object_growth', 0):>8}  {result['status']}")
+
+
+def compare(results, baseline, threshold=10.0):
+    """Print frame-time changes against ``baseline`` and return the pieces that got slower."""
+    regressions = []
+    print(f"\n{'piece':<40} {'p50 ms':>17} {'p95 ms':>17} {'p99 ms':>17}", file=sys.stderr)
+    for piece, result in sorted(results.items()):
+        before = baseline.get(piece)
+        if not before or 'frame_ms' not in before or 'frame_ms' not in result:
+            continue
+        cells = []
+        slower = False
+        for q in ('p50', 'p95', 'p99'):
+            old, new = before['frame_ms'][q], result['frame_ms'][q]
+            change = (new - old) / old * 100 if old > 0 else 0.0
+            slower = slower or (q != 'p99' and change > threshold)
+            cells.append(f'{new:>7.2f} {change:>+7.1f}%')
+        if slower:
+            regressions.append(piece)
+        print(f"{piece:<40} {' '.join(cells)}{'  slower' if slower else ''}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('targets', nargs='*', help='emotion folders or piece files (default: the whole gallery)')
+    parser.add_argument('--frames', type=int, default=300, help='measured frames per piece')
+    parser.add_argument('--warmup', type=int, default=60, help='frames to run before measuring')
+    parser.add_argument('--fps', type=float, default=60.0, help='simulated frames per second')
+    parser.add_argument('--seed', type=int, default=0, help='seed for random and numpy.random')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='pieces measured at once; more than one makes timings noisier')
+    parser.add_argument('--out', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent increase in p50 or p95 frame time reported as slower')
+    args = parser.parse_args(argv)
+
+    print(f"{'piece':<40} {'p50':>7} {'p95':>7} {'p99':>7} {'update':>7} {'draw':>7} "
+          f"{'alloc KB':>9} {'objects':>8}", file=sys.stderr)
+    results = run_benchmarks(discover(args.targets), frames=args.frames, warmup=args.warmup,
+                             fps=args.fps, seed=args.seed, workers=args.workers)
+
+    if args.out:
+        with open(args.out, 'w') as report:
+            json.dump(results, report, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as report:
+            regressions = compare(results, json.load(report), args.threshold)
+        if regressions:
+            print(f'{len(regressions)} pieces slower than the baseline', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Retained-mode item pool for tkinter canvases.
+
+Pieces that redraw everything each frame usually call ``canvas.delete("all")``
+and then recreate every oval, line and text item. ``CanvasPool`` keeps those
+items alive between frames instead: each frame asks the pool for items in
+draw order, the pool moves and restyles existing items with ``coords`` and
+``itemconfig``, and whatever was not asked for is hidden rather than deleted.
+
+    pool = CanvasPool(canvas, layers=('background', 'particles'))
+
+    def animate():
+        pool.begin_frame()
+        for p in particles:
+            pool.oval('particles', x0, y0, x1, y1, fill=p.color, outline='')
+        pool.end_frame()
+
+Items live in named layers. A layer holds one item kind and is stacked in
+the order given by ``layers``; layers that are not declared are stacked
+above the declared ones in the order they are first used.
+
+A reused item ends up styled only by the options of the call that reused it:
+options an earlier call set and this one leaves out (``dash``, ``width``,
+``outline``...) are put back to Tk's defaults for that item kind.
+"""
+
+_CREATE = {
+    'oval': 'create_oval',
+    'line': 'create_line',
+    'rectangle': 'create_rectangle',
+    'polygon': 'create_polygon',
+    'text': 'create_text',
+}
+
+
+class _Layer:
+    __slots__ = ('name', 'kind', 'tag', 'items', 'coords', 'options', 'used', 'shown')
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.tag = f'pool:{name}'
+        self.items = []
+        self.coords = []
+        self.options = []
+        self.used = 0
+        self.shown = 0
+
+
+class CanvasPool:
+    def __init__(self, canvas, layers=()):
+        self.canvas = canvas
+        self.order = list(layers)
+        self.layers = {}
+        self.defaults = {}
+        self.created = 0
+
+    def begin_frame(self):
+        for layer in self.layers.values():
+            layer.used = 0
+
+    def end_frame(self):
+        # Hide whatever was visible last frame but was not drawn this frame
+        canvas = self.canvas
+        for layer in self.layers.values():
+            for index in range(layer.used, layer.shown):
+                canvas.itemconfigure(layer.items[index], state='hidden')
+                layer.options[index]['state'] = 'hidden'
+            layer.shown = layer.used
+
+    def oval(self, layer, x0, y0, x1, y1, **options):
+        return self._draw(layer, 'oval', (x0, y0, x1, y1), options)
+
+    def rectangle(self, layer, x0, y0, x1, y1, **options):
+        return self._draw(layer, 'rectangle', (x0, y0, x1, y1), options)
+
+    def line(self, layer, *coords, **options):
+        return self._draw(layer, 'line', _flatten(coords), options)
+
+    def polygon(self, layer, *coords, **options):
+        return self._draw(layer, 'polygon', _flatten(coords), options)
+
+    def text(self, layer, x, y, **options):
+        return self._draw(layer, 'text', (x, y), options)
+
+    def clear(self):
+        """Hide every pooled item, e.g. before a piece switches scenes."""
+        self.begin_frame()
+        self.end_frame()
+
+    def _layer(self, name, kind):
+        layer = self.layers.get(name)
+        if layer is None:
+            layer = self.layers[name] = _Layer(name, kind)
+            if name not in self.order:
+                self.order.append(name)
+        elif layer.kind != kind:
+            raise ValueError(f"layer {name!r} holds {layer.kind} items, not {kind}")
+        return layer
+
+    def _draw(self, name, kind, coords, options):
+        layer = self._layer(name, kind)
+        index = layer.used
+        layer.used += 1
+        canvas = self.canvas
+
+        if index == len(layer.items):
+            item = getattr(canvas, _CREATE[kind])(*coords, tags=layer.tag, **options)
+            self._restack(layer, item)
+            layer.items.append(item)
+            layer.coords.append(coords)
+            layer.options.append(dict(options, state='normal'))
+            layer.shown = max(layer.shown, layer.used)
+            self.created += 1
+            return item
+
+        item = layer.items[index]
+        if layer.coords[index] != coords:
+            canvas.coords(item, *coords)
+            layer.coords[index] = coords
+
+        # Only send the options that actually changed since the item was last drawn
+        current = layer.options[index]
+        changed = {key: value for key, value in options.items() if key not in current or current[key] != value}
+        # current holds the options of the last call plus 'state'; any other key was
+        # left out of this call and goes back to its default
+        reset = {}
+        stale = current.keys() - options.keys() - {'state'}
+        if stale:
+            defaults = self._defaults(kind, item)
+            for key in stale:
+                if current.pop(key) != defaults[key]:
+                    reset[key] = defaults[key]
+        if index >= layer.shown:
+            changed['state'] = 'normal'
+            layer.shown = index + 1
+        if changed or reset:
+            canvas.itemconfigure(item, **changed, **reset)
+            current.update(changed)
+        return item
+
+    def _defaults(self, kind, item):
+        # Option defaults for an item kind, read from Tk once
+        defaults = self.defaults.get(kind)
+        if defaults is None:
+            defaults = self.defaults[kind] = {key: config[-2] for key, config in
+                                              self.canvas.itemconfigure(item).items()}
+        return defaults
+
+    def _restack(self, layer, item):
+        # New items are created on top of the display list; tuck them below
+        # the first later layer that already has items
+        position = self.order.index(layer.name)
+        for name in self.order[position + 1:]:
+            later = self.layers.get(name)
+            if later is not None and later.items:
+                self.canvas.tag_lower(item, later.tag)
+                return
+
+
+def _flatten(coords):
+    if len(coords) == 1:
+        coords = coords[0]
+    flat = []
+    for value in coords:
+        if isinstance(value, (tuple, list)):
+            flat.extend(value)
+        else:
+            flat.append(value)
+    return tuple(flat)
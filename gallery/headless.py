@@ -0,0 +1,232 @@
+"""Render any pygame piece offscreen at a fixed timestep.
+
+The pieces are written as interactive scripts: they open a window with
+``pygame.display.set_mode`` and loop until the window is closed, pacing
+themselves with ``clock.tick`` and reading ``time.time()`` for animation.
+This runner drives them unchanged on a machine without a display:
+
+- SDL uses its dummy video and audio drivers.
+- The piece runs on a ``gallery.simclock.SimClock``: ``time.time``,
+  ``pygame.time.get_ticks``, sleeps, background threads and the random
+  generators all follow a seeded simulated timeline that advances by exactly
+  one timestep per presented frame, so the same seed renders the same frames.
+- ``pygame.time.Clock.tick`` returns immediately, so frames are produced at
+  full CPU speed.
+- Every ``pygame.display.flip``/``update`` hands the display surface to a
+  frame sink, and the run stops after the requested number of frames.
+  ``--skip`` fast-forwards through frames without writing them.
+
+Usage::
+
+    python3 -m gallery.headless Remorse/claude-4-sonnet.py --frames 1800 --format png --out frames/
+    python3 -m gallery.headless Whimsy/gpt-4-1.py --format raw --out whimsy.rgb --seed 3 --skip 3600
+    python3 -m gallery.headless Whimsy/gpt-4-1.py --format pipe \\
+        --out "ffmpeg -y -f rawvideo -pix_fmt rgb24 -s 900x700 -r 60 -i - whimsy.mp4"
+"""
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+from .simclock import RenderComplete, SimClock, _Patch, run
+
+
+class FixedClock:
+    """Stand-in for ``pygame.time.Clock`` that reports a fixed timestep and never sleeps."""
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def tick(self, framerate=0):
+        return int(round(self.clock.step * 1000))
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return int(round(self.clock.step * 1000))
+
+    get_rawtime = get_time
+
+    def get_fps(self):
+        return float(self.clock.fps)
+
+
+class PngSink:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, surface, index):
+        pygame.image.save(surface, os.path.join(self.directory, f'frame_{index:06d}.png'))
+
+    def close(self):
+        pass
+
+
+class RawSink:
+    """Concatenated rgb24 frames, readable by e.g. ``ffmpeg -f rawvideo -pix_fmt rgb24``."""
+
+    def __init__(self, stream, owned=True):
+        self.stream = stream
+        self.owned = owned
+
+    @classmethod
+    def open(cls, path):
+        return cls(open(path, 'wb'))
+
+    def write(self, surface, index):
+        self.stream.write(pygame.image.tobytes(surface, 'RGB'))
+
+    def close(self):
+        self.stream.flush()
+        if self.owned:
+            self.stream.close()
+
+
+class PipeSink(RawSink):
+    """rgb24 frames written to the stdin of a command, or to stdout for ``-``."""
+
+    def __init__(self, command):
+        self.uses_stdout = command == '-'
+        if self.uses_stdout:
+            super().__init__(sys.stdout.buffer, owned=False)
+            self.process = None
+        else:
+            self.process = subprocess.Popen(shlex.split(command), stdin=subprocess.PIPE)
+            super().__init__(self.process.stdin)
+
+    def close(self):
+        super().close()
+        if self.process is not None:
+            self.process.wait()
+
+
+class VideoSink:
+    """Frames encoded by ffmpeg into a video file, started on the first frame once the size is known."""
+
+    def __init__(self, path, fps=60.0):
+        self.path = path
+        self.fps = fps
+        self.process = None
+
+    def write(self, surface, index):
+        if self.process is None:
+            width, height = surface.get_size()
+            self.process = subprocess.Popen(
+                ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                 '-s', f'{width}x{height}', '-r', str(self.fps), '-i', '-',
+                 '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', self.path],
+                stdin=subprocess.PIPE)
+        self.process.stdin.write(pygame.image.tobytes(surface, 'RGB'))
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+class NullSink:
+    def write(self, surface, index):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_sink(kind, out, fps=60.0):
+    if kind == 'png':
+        return PngSink(out or 'frames')
+    if kind == 'raw':
+        return RawSink.open(out or 'frames.rgb')
+    if kind == 'pipe':
+        return PipeSink(out or '-')
+    if kind == 'mp4':
+        return VideoSink(out or 'frames.mp4', fps)
+    if kind == 'none':
+        return NullSink()
+    raise ValueError(f'unknown frame format: {kind}')
+
+
+def render(path, frames=600, fps=60.0, sink=None, clock=None, seed=0, skip=0, on_frame=None):
+    """Run the piece at ``path`` headlessly and write ``frames`` presented frames.
+
+    The first ``skip`` frames are simulated but not written, and
+    ``on_frame(surface, frame)`` is called after each written one. Returns a dict
+    with the number of frames written, the wall time spent and the resulting
+    simulated frames per second.
+    """
+    sink = sink or NullSink()
+    clock = clock or SimClock(fps, seed=seed)
+    rendered = 0
+    patch = _Patch()
+    flip, update = pygame.display.flip, pygame.display.update
+
+    def present(original):
+        def presented(*args, **kwargs):
+            nonlocal rendered
+            if clock.frame >= skip:
+                original(*args, **kwargs)
+                sink.write(pygame.display.get_surface(), clock.frame)
+                rendered += 1
+                if on_frame is not None:
+                    on_frame(pygame.display.get_surface(), clock.frame)
+            clock.advance()
+            if rendered >= frames:
+                raise RenderComplete
+        return presented
+
+    def delay(ms):
+        clock.sleep(ms / 1000.0)
+        return ms
+
+    patch.set(pygame.time, 'Clock', lambda: FixedClock(clock))
+    patch.set(pygame.time, 'get_ticks', clock.ticks)
+    patch.set(pygame.time, 'delay', delay)
+    patch.set(pygame.time, 'wait', delay)
+    patch.set(pygame.display, 'flip', present(flip))
+    patch.set(pygame.display, 'update', present(update))
+
+    if getattr(sink, 'uses_stdout', False):
+        # Keep anything the piece prints out of the frame stream
+        patch.set(sys, 'stdout', sys.stderr)
+
+    try:
+        seconds = run(path, clock, patch)
+    finally:
+        sink.close()
+
+    return {
+        'piece': path,
+        'frames': rendered,
+        'seconds': seconds,
+        'fps': clock.frame / seconds if seconds > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('piece', help='path to a pygame piece, e.g. Remorse/claude-4-sonnet.py')
+    parser.add_argument('--frames', type=int, default=600, help='number of frames to render')
+    parser.add_argument('--fps', type=float, default=60.0, help='simulated frames per second')
+    parser.add_argument('--seed', type=int, default=0, help='seed for random and numpy.random')
+    parser.add_argument('--skip', type=int, default=0, help='frames to fast-forward through before writing')
+    parser.add_argument('--format', choices=('png', 'raw', 'pipe', 'mp4', 'none'), default='png',
+                        help='png files, one raw rgb24 file, rgb24 piped to a command, an ffmpeg video, or nothing')
+    parser.add_argument('--out', help="output directory (png), file (raw, mp4) or command, '-' for stdout (pipe)")
+    args = parser.parse_args(argv)
+
+    sink = make_sink(args.format, args.out, args.fps)
+    stats = render(args.piece, frames=args.frames, fps=args.fps, sink=sink, seed=args.seed, skip=args.skip)
+    print(f"{stats['piece']}: {stats['frames']} frames in {stats['seconds']:.2f}s ({stats['fps']:.1f} fps)",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
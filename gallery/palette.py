@@ -0,0 +1,131 @@
+"""Quantized HSV and HLS color lookup tables.
+
+Many pieces convert a hue to a color with ``colorsys`` for every particle,
+every frame. ``Palette`` replaces those calls with table lookups:
+
+- Hue is quantized to ``hues`` steps (1024 by default, wrapping around, so
+  -0.25 is the same hue as 0.75), and
+  the other two channels to ``levels`` steps (256, one per output shade).
+- For each saturation/value (or lightness/saturation) pair that is used, a row
+  of RGB tuples and a row of ``#rrggbb`` strings covering every hue is built
+  once, with NumPy, on first use. Later lookups are two list indexings.
+- At most ``max_rows`` rows of each kind are kept, about 70 KB each. Pairs
+  that come after the limit is reached are worked out one color at a time, in
+  plain Python, so memory stays bounded however many pairs a piece uses.
+- ``rgb_array`` converts whole arrays at once, for grids and particle arrays.
+
+    from gallery.palette import HSV
+
+    color = HSV.rgb(hue, 0.9, 0.9 * alpha)        # like colorsys.hsv_to_rgb, scaled to 0-255
+    fill = HSV.hex(hue, 0.8, 0.95)                # for tkinter
+    colors = HSV.rgb_array(hues, 0.4, values)     # (..., 3) uint8
+
+Both models are built from one table of fully saturated hues, so scaling a
+color by an alpha is just scaling its value (HSV) and costs no extra rows
+beyond the distinct values used. Channels are truncated to 0-255 the way
+``int(r * 255)`` is.
+"""
+import math
+
+import numpy as np
+
+
+def _pure_hues(hues):
+    """RGB in 0..1 of every quantized hue at full saturation and value."""
+    h = np.arange(hues) / hues * 6.0
+    return np.clip(np.stack([np.abs(h - 3.0) - 1.0,
+                             2.0 - np.abs(h - 2.0),
+                             2.0 - np.abs(h - 4.0)], axis=-1), 0.0, 1.0)
+
+
+class Palette:
+    """Lookup tables for one color model, ``'hsv'`` or ``'hls'``.
+
+    Arguments are given in the same order as to ``colorsys.hsv_to_rgb`` and
+    ``colorsys.hls_to_rgb``: hue first, then saturation and value, or
+    lightness and saturation.
+    """
+
+    def __init__(self, model='hsv', hues=1024, levels=256, max_rows=64):
+        if model not in ('hsv', 'hls'):
+            raise ValueError(f'unknown color model: {model}')
+        self.model = model
+        self.hues = hues
+        self.levels = levels
+        self.top = levels - 1
+        self.max_rows = max_rows
+        self.table = _pure_hues(hues)
+        self.pure = [tuple(rgb) for rgb in self.table.tolist()]
+        self.rgb_rows = {}
+        self.hex_rows = {}
+
+    def _mix(self, pure, a, b):
+        """Channels in 0..1 for pure hue(s) ``pure`` and the two other inputs."""
+        if self.model == 'hsv':
+            saturation, value = a, b
+            return value * (1.0 - saturation * (1.0 - pure))
+        lightness, saturation = a, b
+        chroma = (1.0 - np.abs(2.0 * lightness - 1.0)) * saturation
+        return lightness + chroma * (pure - 0.5)
+
+    def _inputs(self, key):
+        # Keys are unclamped bucket indices, so that lookups skip the clamping
+        top = self.top
+        return min(max(key[0], 0), top) / top, min(max(key[1], 0), top) / top
+
+    def _row(self, key):
+        a, b = self._inputs(key)
+        channels = self._mix(self.table, a, b)
+        row = self.rgb_rows[key] = list(map(tuple, (channels * 255.0 + 1e-6).astype(np.uint8).tolist()))
+        return row
+
+    def _color(self, key, index):
+        """One RGB tuple, for pairs that get no row; the same arithmetic as ``_mix``."""
+        a, b = self._inputs(key)
+        red, green, blue = self.pure[index]
+        if self.model == 'hsv':
+            return (int((b * (1.0 - a * (1.0 - red))) * 255.0 + 1e-6),
+                    int((b * (1.0 - a * (1.0 - green))) * 255.0 + 1e-6),
+                    int((b * (1.0 - a * (1.0 - blue))) * 255.0 + 1e-6))
+        chroma = (1.0 - abs(2.0 * a - 1.0)) * b
+        return (int((a + chroma * (red - 0.5)) * 255.0 + 1e-6),
+                int((a + chroma * (green - 0.5)) * 255.0 + 1e-6),
+                int((a + chroma * (blue - 0.5)) * 255.0 + 1e-6))
+
+    def rgb(self, h, a, b):
+        """RGB tuple in 0..255."""
+        top = self.top
+        key = (int(a * top + 0.5), int(b * top + 0.5))
+        row = self.rgb_rows.get(key)
+        if row is None:
+            if len(self.rgb_rows) >= self.max_rows:
+                return self._color(key, math.floor(h * self.hues) % self.hues)
+            row = self._row(key)
+        return row[math.floor(h * self.hues) % self.hues]
+
+    def hex(self, h, a, b):
+        """``#rrggbb`` string, as tkinter takes colors."""
+        top = self.top
+        key = (int(a * top + 0.5), int(b * top + 0.5))
+        row = self.hex_rows.get(key)
+        if row is None:
+            rgb_row = self.rgb_rows.get(key)
+            if rgb_row is None and len(self.rgb_rows) < self.max_rows:
+                rgb_row = self._row(key)
+            if rgb_row is None or len(self.hex_rows) >= self.max_rows:
+                return '#%02x%02x%02x' % self.rgb(h, a, b)
+            row = self.hex_rows[key] = ['#%02x%02x%02x' % rgb for rgb in rgb_row]
+        return row[math.floor(h * self.hues) % self.hues]
+
+    def rgb_array(self, h, a, b):
+        """RGB of broadcast array inputs as a ``uint8`` array with a trailing axis of 3."""
+        top = self.top
+        index = np.floor(np.asarray(h) * self.hues).astype(np.int64) % self.hues
+        a = np.clip(np.rint(np.asarray(a, dtype=float) * top), 0, top) / top
+        b = np.clip(np.rint(np.asarray(b, dtype=float) * top), 0, top) / top
+        channels = self._mix(self.table[index], a[..., None], b[..., None])
+        return (channels * 255.0 + 1e-6).astype(np.uint8)
+
+
+HSV = Palette('hsv')
+HLS = Palette('hls')
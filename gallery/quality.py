@@ -0,0 +1,89 @@
+"""Frame-budget quality control for pygame pieces.
+
+A piece marks where each frame's work starts and ends, and asks the
+controller for its detail settings between the two:
+
+    quality = QualityController(fps=60)
+    while running:
+        quality.begin_frame()
+        rings = quality.pick(10, 3)        # 10 at full quality, 3 at the lowest
+        trail = quality.pick(1.0, 0.3)
+        ...
+        pygame.display.flip()
+        quality.end_frame()
+        clock.tick(60)
+
+The controller keeps a smoothed average of the time between ``begin_frame``
+and ``end_frame``, which leaves out the time ``clock.tick`` sleeps. It moves
+``level`` between 0 (least detail) and 1 (full detail) in fixed steps:
+
+- down one step after ``patience[0]`` frames in a row over ``headroom[1]``
+  of the frame budget;
+- up one step after ``patience[1]`` frames in a row under ``headroom[0]``
+  of it.
+
+Going down is quick and going up is slow, with a gap between the two
+thresholds, so the level settles instead of flickering between two settings.
+
+``--quality LEVEL`` on the command line, or the ``GALLERY_QUALITY``
+environment variable, pins the level. ``gallery.simclock`` pins it to 1 so
+that renders and benchmarks do not depend on how fast the machine is.
+"""
+import os
+import sys
+import time
+
+_perf_counter = time.perf_counter
+
+
+def pinned_level(argv=None):
+    """The level given by ``--quality`` or ``GALLERY_QUALITY``, or None to adapt."""
+    argv = sys.argv if argv is None else argv
+    if '--quality' in argv and argv.index('--quality') + 1 < len(argv):
+        return min(1.0, max(0.0, float(argv[argv.index('--quality') + 1])))
+    if os.environ.get('GALLERY_QUALITY'):
+        return min(1.0, max(0.0, float(os.environ['GALLERY_QUALITY'])))
+    return None
+
+
+class QualityController:
+    """Adjusts ``level`` to hold the frame work time within the budget for ``fps``."""
+
+    def __init__(self, fps=60.0, step=0.125, headroom=(0.6, 0.9), patience=(20, 120), smoothing=0.9, level=None):
+        pinned = pinned_level() if level is None else level
+        self.pinned = pinned is not None
+        self.level = 1.0 if pinned is None else pinned
+        self.budget = 1.0 / fps
+        self.step = step
+        self.headroom = headroom
+        self.patience = patience
+        self.smoothing = smoothing
+        self.average = 0.0
+        self.slow_frames = 0
+        self.fast_frames = 0
+        self.started = _perf_counter()
+
+    def begin_frame(self):
+        self.started = _perf_counter()
+
+    def end_frame(self):
+        if self.pinned:
+            return
+        keep = self.smoothing
+        self.average = self.average * keep + (_perf_counter() - self.started) * (1 - keep)
+        load = self.average / self.budget
+        self.slow_frames = self.slow_frames + 1 if load > self.headroom[1] else 0
+        self.fast_frames = self.fast_frames + 1 if load < self.headroom[0] else 0
+        if self.slow_frames >= self.patience[0] and self.level > 0.0:
+            self.level = max(0.0, self.level - self.step)
+            self.slow_frames = self.fast_frames = 0
+        elif self.fast_frames >= self.patience[1] and self.level < 1.0:
+            self.level = min(1.0, self.level + self.step)
+            self.slow_frames = self.fast_frames = 0
+
+    def pick(self, full, least):
+        """``full`` at level 1, ``least`` at level 0, in between otherwise; whole numbers stay whole."""
+        value = least + (full - least) * self.level
+        if isinstance(full, int) and isinstance(least, int):
+            return int(round(value))
+        return value
@@ -0,0 +1,114 @@
+"""Draw lists that background threads hand to the tkinter main thread.
+
+Tk is not thread-safe, yet several pieces animate from a background thread
+that calls ``canvas.create_oval``, ``coords`` and ``delete`` directly. Each of
+those calls contends for the Tcl interpreter with the main loop.
+``RenderQueue`` keeps every Tk call on the main thread instead:
+
+    render_queue = RenderQueue(canvas)
+
+    def worker():
+        while True:
+            draw = render_queue.begin()
+            draw.delete('all')
+            dot = draw.create_oval(x0, y0, x1, y1, fill='#ff3333', outline='')
+            draw.itemconfig(dot, fill='#993333')
+            render_queue.submit(draw)
+            time.sleep(0.05)
+
+A ``DrawList`` records any widget method call, in order, without touching Tk.
+``create_*`` calls return a ``Handle`` that stands in for the item id. A
+handle can be passed to later calls in the same list or in later lists, and
+it resolves once its list has run. Submitted lists are run in order on the
+main thread by a single ``after`` callback per frame.
+
+Worker threads must not ask Tk anything either. ``size()`` returns the
+widget's size as measured on the main thread at the last frame.
+"""
+import collections
+import tkinter
+import traceback
+
+
+class Handle:
+    """Stands in for the id of an item created by a draw list that has not run yet."""
+    __slots__ = ('id',)
+
+    def __init__(self):
+        self.id = None
+
+
+class DrawList:
+    """Widget method calls recorded on any thread, to be replayed on the main thread."""
+
+    def __init__(self):
+        self.commands = []
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        commands = self.commands
+
+        def record(*args, **options):
+            handle = Handle() if name.startswith('create_') else None
+            commands.append((name, args, options, handle))
+            return handle
+        return record
+
+    def __len__(self):
+        return len(self.commands)
+
+
+class RenderQueue:
+    """Runs submitted draw lists against ``widget`` once every ``interval`` milliseconds."""
+
+    def __init__(self, widget, interval=16):
+        self.widget = widget
+        self.interval = interval
+        # deque appends and pops are atomic, so producers never take a lock
+        self.pending = collections.deque()
+        self.width = widget.winfo_reqwidth()
+        self.height = widget.winfo_reqheight()
+        self.running = True
+        widget.after(interval, self.drain)
+
+    def begin(self):
+        return DrawList()
+
+    def submit(self, draw):
+        if draw.commands:
+            self.pending.append(draw.commands)
+
+    def size(self):
+        return self.width, self.height
+
+    def drain(self):
+        widget = self.widget
+        pending = self.pending
+        while pending:
+            for name, args, options, handle in pending.popleft():
+                if any(type(arg) is Handle for arg in args):
+                    args = [arg.id if type(arg) is Handle else arg for arg in args]
+                try:
+                    item = getattr(widget, name)(*args, **options)
+                except tkinter.TclError:
+                    if not self.alive():
+                        return
+                    # e.g. a bad color or font; skip the call like Tk's own error handler would
+                    traceback.print_exc()
+                    continue
+                if handle is not None:
+                    handle.id = item
+        if not self.alive():
+            return
+        if widget.winfo_ismapped():
+            self.width, self.height = widget.winfo_width(), widget.winfo_height()
+        widget.after(self.interval, self.drain)
+
+    def alive(self):
+        try:
+            self.running = bool(self.widget.winfo_exists())
+        except tkinter.TclError:
+            # The window was closed
+            self.running = False
+        return self.running
@@ -0,0 +1,385 @@
+"""Deterministic simulation clock for replaying and fast-forwarding pieces.
+
+The pieces read ``time.time()`` wherever they need it, pace themselves with
+``clock.tick``, ``root.after`` or ``time.sleep``, draw from the global
+``random`` and ``numpy.random`` generators and sometimes animate from
+background threads. ``SimClock`` puts all of those on one simulated timeline:
+
+- ``time.time`` returns simulated seconds that only move when a frame is
+  presented, the main thread sleeps, or the tkinter loop reaches its next timer.
+- ``random`` and ``numpy.random`` are seeded before the piece is loaded, and a
+  piece that reseeds them without an argument gets the same seed again.
+- Background threads run one at a time. A thread runs from the moment it is
+  started until it calls ``time.sleep``, then waits until the simulated clock
+  reaches its wake-up time. Wake-ups are handed out in time order, so threads
+  interleave the same way on every run.
+- tkinter ``after`` timers go on the same timeline, and ``mainloop`` is replaced
+  by a loop that steps from timer to timer and redraws the window once per frame.
+- matplotlib pieces, run with ``figures=True``, draw offscreen with the Agg
+  backend; the timers behind their ``FuncAnimation`` go on the same timeline,
+  and ``plt.show`` runs the same loop.
+- Pieces that adapt their detail to the frame time with
+  ``gallery.quality`` run at full quality, or at the level in
+  ``GALLERY_QUALITY`` if it is set.
+
+Two runs with the same seed and frame rate produce the same frames, and since
+nothing waits on the wall clock a run can be fast-forwarded to any point.
+
+Usage::
+
+    python3 -m gallery.simclock Whimsy/gpt-o3.py --seconds 120 --seed 7
+    python3 -m gallery.simclock Remorse/claude-3-7-sonnet.py --skip 300 --realtime
+
+Pygame pieces are rendered on the same clock by ``gallery.headless``.
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import runpy
+import sys
+import threading
+import time
+import traceback
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import tkinter
+except ImportError:
+    tkinter = None
+
+_perf_counter = time.perf_counter
+_sleep = time.sleep
+
+# A fixed, realistic wall-clock reading, so pieces that compare time.time()
+# against zero or format it as a date behave as they do live
+EPOCH = 1700000000.0
+
+
+class RenderComplete(BaseException):
+    """Raised from inside the piece's main loop once the run has gone far enough.
+
+    Derives from BaseException so that ``except Exception`` blocks in a piece
+    do not swallow it.
+    """
+
+
+class SimClock:
+    """Simulated wall clock and scheduler shared by a piece, its threads and its tkinter timers."""
+
+    def __init__(self, fps=60.0, seed=0, start=EPOCH, until=None, handoff_timeout=5.0):
+        self.fps = fps
+        self.step = 1.0 / fps
+        self.seed = seed
+        self.start = start
+        self.now = start
+        self.frame = 0
+        self.until = until
+        self.handoff_timeout = handoff_timeout
+        self.main_thread = threading.main_thread()
+        self.condition = threading.Condition()
+        self.sequence = itertools.count()
+        self.wakeups = []
+        self.timers = []
+        self.cancelled = set()
+        self.running = None
+        self.released = False
+        # Timer callbacks and thread wake-ups handed out so far
+        self.dispatched = 0
+
+    def time(self):
+        return self.now
+
+    def elapsed(self):
+        return self.now - self.start
+
+    def ticks(self):
+        return int(self.elapsed() * 1000)
+
+    def seed_rngs(self):
+        random.seed(self.seed)
+        if np is not None:
+            np.random.seed(self.seed)
+
+    def advance(self, seconds=None):
+        """Move forward one frame, or by ``seconds`` when the main thread sleeps."""
+        if seconds is None:
+            self.frame += 1
+            seconds = self.step
+        target = self.now + max(seconds, 0.0)
+        self.run_threads(target)
+        self.now = target
+        if self.until is not None and self.elapsed() >= self.until:
+            raise RenderComplete
+
+    def run_threads(self, target):
+        """Wake every sleeping thread due by ``target``, one at a time and in order."""
+        while self.wakeups and self.wakeups[0][0] <= target:
+            due, _, thread = heapq.heappop(self.wakeups)
+            self.now = max(self.now, due)
+            self.dispatched += 1
+            self.hand_over(thread)
+
+    def hand_over(self, thread, start=None):
+        """Let ``thread`` run until it sleeps again or exits, then take control back."""
+        with self.condition:
+            previous = self.running
+            self.running = thread
+            if start is not None:
+                start()
+            else:
+                self.condition.notify_all()
+            deadline = _perf_counter() + self.handoff_timeout
+            while self.running is thread and thread.is_alive():
+                self.condition.wait(0.05)
+                if _perf_counter() > deadline:
+                    # A thread that never sleeps (or blocks on something else)
+                    # is left to run freely rather than stalling the whole piece
+                    print(f'simclock: {thread.name} did not yield, running it unscheduled', file=sys.stderr)
+                    break
+            self.running = previous
+
+    def sleep(self, seconds):
+        me = threading.current_thread()
+        # The main thread is what moves the clock, so its sleeps just skip ahead
+        if me is self.main_thread:
+            self.advance(seconds)
+            return
+        with self.condition:
+            if self.released:
+                raise SystemExit
+            heapq.heappush(self.wakeups, (self.now + max(seconds, 0.0), next(self.sequence), me))
+            if self.running is me:
+                self.running = None
+            self.condition.notify_all()
+            self.condition.wait_for(lambda: self.running is me or self.released)
+            if self.released:
+                raise SystemExit
+
+    def release(self):
+        """End the run: any thread still waiting on the clock exits when it wakes."""
+        with self.condition:
+            self.released = True
+            self.condition.notify_all()
+
+    def schedule(self, delay, func, args=()):
+        with self.condition:
+            sequence = next(self.sequence)
+            timer_id = f'after#sim{sequence}'
+            heapq.heappush(self.timers, (self.now + max(delay, 0.0), sequence, timer_id, func, args))
+        return timer_id
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            self.sleep(ms / 1000.0)
+            return None
+        return self.schedule(ms / 1000.0, func, args)
+
+    def after_cancel(self, timer_id):
+        self.cancelled.add(timer_id)
+
+    def mainloop(self, widget, skip=0.0, realtime=False, on_frame=None):
+        """Stand-in for ``tkinter.Misc.mainloop`` that walks the timeline frame by frame.
+
+        Frames before ``skip`` simulated seconds are computed but not drawn.
+        With ``realtime`` the remaining frames are paced to the wall clock.
+        ``on_frame(widget, frame)`` is called after each drawn frame.
+        """
+        started = _perf_counter()
+        while True:
+            boundary = self.start + (self.frame + 1) * self.step
+            while self.timers and self.timers[0][0] <= boundary:
+                due, _, timer_id, func, args = heapq.heappop(self.timers)
+                if timer_id in self.cancelled:
+                    self.cancelled.discard(timer_id)
+                    continue
+                self.run_threads(due)
+                self.now = max(self.now, due)
+                self.dispatched += 1
+                try:
+                    func(*args)
+                except Exception:
+                    traceback.print_exc()
+            self.run_threads(boundary)
+            self.now = max(self.now, boundary)
+            if self.elapsed() >= skip:
+                if realtime:
+                    _sleep(max(0.0, (self.elapsed() - skip) - (_perf_counter() - started)))
+                try:
+                    widget.update()
+                except tkinter.TclError:
+                    # The window was closed
+                    return
+                if on_frame is not None:
+                    on_frame(widget, self.frame)
+            else:
+                started = _perf_counter()
+            self.frame += 1
+            if self.until is not None and self.elapsed() >= self.until:
+                raise RenderComplete
+
+
+class _Patch:
+    """Swap attributes on modules for the duration of a run and put them back afterwards."""
+
+    def __init__(self):
+        self.saved = []
+
+    def set(self, target, name, value):
+        self.saved.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def setenv(self, name, value):
+        self.saved.append((os.environ, name, os.environ.get(name)))
+        os.environ[name] = value
+
+    def restore(self):
+        while self.saved:
+            target, name, value = self.saved.pop()
+            if target is not os.environ:
+                setattr(target, name, value)
+            elif value is None:
+                del os.environ[name]
+            else:
+                os.environ[name] = value
+
+
+def install(clock, patch, skip=0.0, realtime=False, on_frame=None):
+    """Point the piece's clock reads, sleeps, threads, timers and RNGs at ``clock``."""
+    start_thread = threading.Thread.start
+    asyncio_sleep = asyncio.sleep
+    random_seed = random.seed
+
+    def start(thread):
+        clock.hand_over(thread, start=lambda: start_thread(thread))
+
+    async def sleep(delay, result=None):
+        clock.sleep(delay)
+        return await asyncio_sleep(0, result)
+
+    patch.set(time, 'time', clock.time)
+    patch.set(time, 'sleep', clock.sleep)
+    patch.set(threading.Thread, 'start', start)
+    patch.set(asyncio, 'sleep', sleep)
+    # Adaptive quality would make the frames depend on the speed of the machine
+    patch.setenv('GALLERY_QUALITY', os.environ.get('GALLERY_QUALITY') or '1')
+    patch.set(random, 'seed', lambda a=None, version=2: random_seed(clock.seed if a is None else a, version))
+    if np is not None:
+        numpy_seed = np.random.seed
+        patch.set(np.random, 'seed', lambda seed=None: numpy_seed(clock.seed if seed is None else seed))
+    if tkinter is not None:
+        patch.set(tkinter.Misc, 'after', lambda widget, ms, func=None, *args: clock.after(ms, func, *args))
+        patch.set(tkinter.Misc, 'after_idle', lambda widget, func, *args: clock.schedule(0.0, func, args))
+        patch.set(tkinter.Misc, 'after_cancel', lambda widget, timer_id: clock.after_cancel(timer_id))
+        patch.set(tkinter.Misc, 'mainloop', lambda widget, n=0: clock.mainloop(widget, skip, realtime, on_frame))
+    clock.seed_rngs()
+
+
+class _Figures:
+    """Stands in for the tkinter root in ``SimClock.mainloop`` while matplotlib figures animate.
+
+    Animations draw from their own timers, so there is nothing to update per frame.
+    """
+
+    def update(self):
+        pass
+
+
+def install_figures(clock, patch, skip=0.0, realtime=False, on_frame=None):
+    """Draw matplotlib figures offscreen and run their animation timers on ``clock``."""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import backend_bases, pyplot
+
+    class SimTimer(backend_bases.TimerBase):
+        # matplotlib's tkinter timer, with after() on the simulated clock
+        def __init__(self, *args, **kwargs):
+            self._timer = None
+            super().__init__(*args, **kwargs)
+
+        def _timer_start(self):
+            self._timer_stop()
+            self._timer = clock.after(self._interval, self._on_timer)
+
+        def _timer_stop(self):
+            if self._timer is not None:
+                clock.after_cancel(self._timer)
+            self._timer = None
+
+        def _on_timer(self):
+            super()._on_timer()
+            if not self._single and self._timer:
+                self._timer = clock.after(self._interval, self._on_timer)
+            else:
+                self._timer = None
+
+    def show(*args, **kwargs):
+        # A FuncAnimation starts its timer on the first draw of its figure
+        for number in pyplot.get_fignums():
+            pyplot.figure(number).canvas.draw()
+        clock.mainloop(_Figures(), skip, realtime, on_frame)
+
+    patch.set(backend_bases.FigureCanvasBase, '_timer_cls', SimTimer)
+    patch.set(pyplot, 'show', show)
+
+
+def run(path, clock, patch, skip=0.0, realtime=False, on_frame=None, figures=False):
+    """Run the piece at ``path`` as ``__main__`` on ``clock`` and return the wall time spent.
+
+    ``figures`` is for pieces that animate matplotlib figures rather than a tkinter window.
+    """
+    install(clock, patch, skip, realtime, on_frame)
+    if figures:
+        install_figures(clock, patch, skip, realtime, on_frame)
+    argv = sys.argv
+    sys.argv = [path]
+    started = _perf_counter()
+    try:
+        runpy.run_path(path, run_name='__main__')
+    except (RenderComplete, SystemExit):
+        pass
+    finally:
+        seconds = _perf_counter() - started
+        sys.argv = argv
+        clock.release()
+        patch.restore()
+    return seconds
+
+
+def simulate(path, seconds=60.0, fps=60.0, seed=0, skip=0.0, realtime=False, on_frame=None):
+    """Run a tkinter piece for ``seconds`` simulated seconds after skipping ``skip`` seconds."""
+    clock = SimClock(fps, seed=seed, until=skip + seconds)
+    wall = run(path, clock, _Patch(), skip, realtime, on_frame)
+    return {
+        'piece': path,
+        'frames': clock.frame,
+        'simulated': clock.elapsed(),
+        'seconds': wall,
+        'speedup': clock.elapsed() / wall if wall > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('piece', help='path to a tkinter piece, e.g. Whimsy/gpt-o3.py')
+    parser.add_argument('--seconds', type=float, default=60.0, help='simulated seconds to show')
+    parser.add_argument('--fps', type=float, default=60.0, help='simulated frames per second')
+    parser.add_argument('--seed', type=int, default=0, help='seed for random and numpy.random')
+    parser.add_argument('--skip', type=float, default=0.0, help='simulated seconds to fast-forward through first')
+    parser.add_argument('--realtime', action='store_true', help='pace the shown frames to the wall clock')
+    args = parser.parse_args(argv)
+
+    stats = simulate(args.piece, seconds=args.seconds, fps=args.fps, seed=args.seed,
+                     skip=args.skip, realtime=args.realtime)
+    print(f"{stats['piece']}: {stats['frames']} frames, {stats['simulated']:.1f}s simulated "
+          f"in {stats['seconds']:.2f}s ({stats['speedup']:.1f}x)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
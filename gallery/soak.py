@@ -0,0 +1,262 @@
+"""Soak tests: run every piece for a simulated day and fail the ones whose memory keeps growing.
+
+Gallery boxes run a piece for weeks. A list that gains a few items a frame
+does not show up in a one-minute render, but after a few days it can get the
+box killed for running out of memory. Each piece runs on a seeded
+``gallery.simclock`` timeline for ``--hours`` simulated hours, in a fresh
+process. Pygame pieces are stepped at ``--fps`` (10 by default, so a day is
+864,000 frames). Tkinter and matplotlib pieces run their timers at the rates
+they ask for. A full day takes hours per piece, so soak runs are meant for
+overnight jobs, with ``--hours`` set lower for a quick check. Every
+``--interval`` simulated seconds, the worker samples:
+
+- its resident memory (RSS);
+- the number of live Python objects, after a full collection;
+- the length of every list, dict, set, deque or other sized container that
+  the piece holds, in its module globals, in the locals of its running
+  functions, and one attribute deep in objects of classes it defines
+  (e.g. ``dream.ephemeral_connections``).
+
+The first ``--settle`` simulated seconds are for pools, caches and particle
+counts to fill up. Each measure's peak over that time is its baseline. A
+measure has grown too much if, at the end of the run, it is more than
+``--growth`` times its baseline above the baseline. It must also be more than
+the slack above the baseline: ``--rss-mb`` megabytes, ``--objects`` objects or
+``--items`` items. This keeps small collections that come and go from failing
+the run. A piece that stops before the end of the run, or never reaches a
+frame (e.g. one that loops on ``time.sleep`` instead of a main loop), has
+failed to run. The command exits with status 1 if any piece grew too much, or
+if any piece failed to run.
+
+Usage::
+
+    python3 -m gallery.soak --out soak.json
+    python3 -m gallery.soak Whimsy/claude-3-5-haiku.py Remorse --hours 2 --interval 60
+"""
+import argparse
+import collections.abc
+import concurrent.futures
+import gc
+import json
+import multiprocessing
+import os
+import sys
+
+from gallery.batch import ROOT, discover, peak_rss_mb, piece_kind
+from gallery.bench import type_counts
+
+
+def current_rss_mb():
+    """Resident memory of this process now, or its peak where that cannot be read."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+
+def sized(value):
+    """Length of a container that can grow, or None for anything else."""
+    if isinstance(value, (str, bytes, tuple, range, type)) or not isinstance(value, collections.abc.Sized):
+        return None
+    try:
+        return len(value)
+    except Exception:
+        return None
+
+
+def collection_lengths(path):
+    """Lengths of the containers held by the piece at ``path``, found on the current call stack."""
+    defined = {}
+
+    def defined_here(cls):
+        # Classes whose methods were compiled from the piece's file
+        if cls not in defined:
+            defined[cls] = any(getattr(getattr(member, '__code__', None), 'co_filename', None) == path
+                               for base in cls.__mro__ for member in vars(base).values())
+        return defined[cls]
+
+    lengths = {}
+    frame = sys._getframe()
+    while frame is not None:
+        if frame.f_code.co_filename == path:
+            scope = '' if frame.f_locals is frame.f_globals else f'{frame.f_code.co_name}:'
+            for name, value in list(frame.f_locals.items()):
+                if name.startswith('__'):
+                    continue
+                length = sized(value)
+                if length is not None:
+                    lengths[scope + name] = length
+                elif not isinstance(value, type) and defined_here(type(value)) and hasattr(value, '__dict__'):
+                    for attribute, member in list(vars(value).items()):
+                        length = sized(member)
+                        if length is not None:
+                            lengths[f'{scope}{name}.{attribute}'] = length
+        frame = frame.f_back
+    return lengths
+
+
+def sample(path, elapsed):
+    gc.collect()
+    return {'hours': elapsed / 3600, 'rss_mb': current_rss_mb(), 'objects': len(gc.get_objects()),
+            'collections': collection_lengths(path)}
+
+
+def soak(job):
+    """Worker entry point: run one piece for the whole soak and return its samples."""
+    from gallery import simclock
+
+    path, seconds, interval = job['path'], job['hours'] * 3600, job['interval']
+    # A piece that never reaches a frame, e.g. one looping on time.sleep, is
+    # stopped an interval after the soak should have ended
+    clock = simclock.SimClock(job['fps'], seed=job['seed'], until=seconds + interval)
+    samples = []
+    state = {'next': 0.0, 'types': None, 'done': False}
+    result = {'piece': job['piece'], 'kind': job['kind'], 'status': 'ok', 'samples': samples}
+
+    def on_frame(*_):
+        elapsed = clock.elapsed()
+        if elapsed < state['next']:
+            return
+        samples.append(sample(path, elapsed))
+        if state['types'] is None and elapsed >= job['settle']:
+            state['types'] = type_counts()
+        state['next'] += interval
+        if elapsed >= seconds:
+            # Taken here, while the piece is still running and holding its objects
+            if state['types'] is not None:
+                result['top_growth'] = (type_counts() - state['types']).most_common(5)
+            state['done'] = True
+            raise simclock.RenderComplete
+
+    try:
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull
+            if job['kind'] == 'pygame':
+                from gallery import headless
+                headless.render(path, frames=sys.maxsize, clock=clock, on_frame=on_frame)
+            else:
+                simclock.run(path, clock, simclock._Patch(), on_frame=on_frame,
+                             figures=job['kind'] == 'matplotlib')
+    except Exception as error:
+        result['status'] = f'{type(error).__name__}: {error}'
+    finally:
+        sys.stdout = sys.__stdout__
+    if result['status'] == 'ok' and not state['done']:
+        if not samples:
+            result['status'] = f"no samples in {clock.elapsed() / 3600:.1f} simulated hours"
+        else:
+            result['status'] = f"stopped after {samples[-1]['hours']:.1f} simulated hours"
+    return result
+
+
+def grew(samples, settle, growth, slack):
+    """Measures that ended more than ``growth`` times and ``slack`` above their peak while settling.
+
+    Returns ``{name: (baseline, final)}``. ``slack`` gives the allowance for
+    ``'rss_mb'``, ``'objects'`` and ``'items'``, the last for every collection.
+    """
+    settling = [entry for entry in samples if entry['hours'] * 3600 <= settle]
+    if not settling or samples[-1] is settling[-1]:
+        return {}
+
+    def measures(entry):
+        values = {name: (entry['collections'][name], slack['items']) for name in entry['collections']}
+        values['rss_mb'] = (entry['rss_mb'], slack['rss_mb'])
+        values['objects'] = (entry['objects'], slack['objects'])
+        return values
+
+    baseline = {}
+    for entry in settling:
+        for name, (value, _) in measures(entry).items():
+            if value is not None:
+                baseline[name] = max(baseline.get(name, value), value)
+    grown = {}
+    for name, (final, allowed) in measures(samples[-1]).items():
+        start = baseline.get(name, 0)
+        if final is not None and final - start > max(start * growth, allowed):
+            grown[name] = (start, final)
+    return grown
+
+
+def run_soak(pieces, hours=24.0, fps=10.0, interval=600.0, settle=3600.0, seed=0, workers=None,
+             growth=0.5, slack=None):
+    """Soak ``pieces`` and return one result dict per piece, keyed by piece, with a ``grown`` entry."""
+    slack = dict({'rss_mb': 64, 'objects': 20000, 'items': 500}, **(slack or {}))
+    results = {}
+    jobs = []
+    for piece in pieces:
+        kind = piece_kind(os.path.join(ROOT, piece))
+        results[piece] = {'piece': piece, 'kind': kind, 'status': 'ok' if kind else 'skipped', 'samples': []}
+        if kind is None:
+            print(format_result(results[piece]), file=sys.stderr)
+            continue
+        jobs.append({'piece': piece, 'path': os.path.join(ROOT, piece), 'kind': kind, 'hours': hours,
+                     'fps': fps, 'interval': interval, 'settle': settle, 'seed': seed})
+
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                max_tasks_per_child=1) as pool:
+        for result in pool.map(soak, jobs):
+            result['grown'] = grew(result['samples'], settle, growth, slack)
+            if result['grown']:
+                result['status'] = 'grew: ' + ', '.join(sorted(result['grown']))
+            results[result['piece']] = result
+            print(format_result(result), file=sys.stderr)
+    return results
+
+
+def format_result(result):
+    samples = result['samples']
+    if not samples:
+        return f"{result['piece']:<40} {result['status']}"
+    first, last = samples[0], samples[-1]
+    rss = '-' if last['rss_mb'] is None else f"{first['rss_mb']:.0f}>{last['rss_mb']:.0f}"
+    return (f"{result['piece']:<40} {last['hours']:>6.1f} {rss:>9} {first['objects']:>8} {last['objects']:>8}"
+            f"  {result['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('targets', nargs='*', help='emotion folders or piece files (default: the whole gallery)')
+    parser.add_argument('--hours', type=float, default=24.0, help='simulated hours to run each piece for')
+    parser.add_argument('--fps', type=float, default=10.0, help='simulated frames per second for pygame pieces')
+    parser.add_argument('--interval', type=float, default=600.0, help='simulated seconds between samples')
+    parser.add_argument('--settle', type=float, default=3600.0,
+                        help='simulated seconds whose peak is the baseline for growth')
+    parser.add_argument('--seed', type=int, default=0, help='seed for random and numpy.random')
+    parser.add_argument('--workers', type=int, help='pieces run at once (default: one per CPU)')
+    parser.add_argument('--growth', type=float, default=0.5,
+                        help='fraction above its baseline a measure may end at')
+    parser.add_argument('--rss-mb', type=float, default=64, help='RSS growth always allowed, in MB')
+    parser.add_argument('--objects', type=int, default=20000, help='live object growth always allowed')
+    parser.add_argument('--items', type=int, default=500, help='growth of any one collection always allowed')
+    parser.add_argument('--out', help='write the results, with every sample, to this JSON file')
+    args = parser.parse_args(argv)
+
+    print(f"{'piece':<40} {'hours':>6} {'rss MB':>9} {'objects':>8} {'at end':>8}  status", file=sys.stderr)
+    results = run_soak(discover(args.targets), hours=args.hours, fps=args.fps, interval=args.interval,
+                       settle=args.settle, seed=args.seed, workers=args.workers, growth=args.growth,
+                       slack={'rss_mb': args.rss_mb, 'objects': args.objects, 'items': args.items})
+
+    if args.out:
+        with open(args.out, 'w') as report:
+            json.dump(results, report, indent=2)
+
+    grown = [piece for piece, result in results.items() if result.get('grown')]
+    for piece in grown:
+        for name, (start, final) in sorted(results[piece]['grown'].items()):
+            print(f'{piece}: {name} grew from {start:.0f} to {final:.0f}', file=sys.stderr)
+    if grown:
+        print(f'{len(grown)} pieces kept growing', file=sys.stderr)
+    # A piece that crashed part way through has not shown that it stays bounded
+    failed = [piece for piece, result in results.items()
+              if result['status'] not in ('ok', 'skipped') and not result.get('grown')]
+    if failed:
+        print(f'{len(failed)} pieces failed to run', file=sys.stderr)
+    if grown or failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
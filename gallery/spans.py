@@ -0,0 +1,151 @@
+"""Named timing spans for a piece's main loop, with an on-screen HUD and Chrome trace export.
+
+Wrap each phase of a frame in a span, nest spans for groups of entities, and
+close the frame once it has been presented::
+
+    profiler = Profiler(trace=trace_path())
+    while running:
+        with profiler.span('events'):
+            ...
+        with profiler.span('update'):
+            with profiler.span('particles'):
+                ...
+        profiler.draw_hud(screen)
+        with profiler.span('flip'):
+            pygame.display.flip()
+        profiler.end_frame()
+    profiler.close()
+
+The HUD lists every span under its parent with its average time over recent
+frames, against the frame budget. Passing ``--trace frames.json`` on a
+piece's command line keeps the spans of the last frames and writes them on
+exit, however the loop ends, in the Chrome trace event format that
+chrome://tracing and https://ui.perfetto.dev can open.
+"""
+import atexit
+import collections
+import json
+import os
+import sys
+import time
+
+_perf_counter = time.perf_counter
+
+
+def trace_path(argv=None):
+    """The file named after ``--trace`` on the command line, or None."""
+    argv = sys.argv if argv is None else argv
+    if '--trace' not in argv:
+        return None
+    index = argv.index('--trace') + 1
+    return argv[index] if index < len(argv) else 'trace.json'
+
+
+class _Span:
+    __slots__ = ('profiler', 'key', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        stack = profiler.stack
+        self.key = f'{stack[-1]}/{name}' if stack else name
+
+    def __enter__(self):
+        profiler = self.profiler
+        if self.key not in profiler.averages:
+            profiler.averages[self.key] = 0.0
+            profiler.depths[self.key] = len(profiler.stack)
+        profiler.stack.append(self.key)
+        self.start = _perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = _perf_counter()
+        profiler = self.profiler
+        profiler.stack.pop()
+        profiler.current.append((self.key, self.start, end))
+
+
+class Profiler:
+    """Collects one frame's spans at a time, keeping rolling averages for the HUD
+    and, when tracing, the spans of the last ``keep`` frames."""
+
+    def __init__(self, trace=None, keep=600, budget=1 / 60, smoothing=0.9, hud=False):
+        self.trace = trace
+        self.frames = collections.deque(maxlen=keep)
+        self.current = []
+        self.stack = []
+        self.averages = {}
+        self.depths = {}
+        self.frame_ms = 0.0
+        self.frame_start = _perf_counter()
+        self.budget_ms = budget * 1000
+        self.smoothing = smoothing
+        self.hud = hud
+        self.font = None
+        if trace is not None:
+            # Also write the trace when the loop is left through an exception
+            atexit.register(self.close)
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def end_frame(self):
+        now = _perf_counter()
+        spans, self.current = self.current, []
+        if self.trace is not None:
+            self.frames.append((self.frame_start, now, spans))
+
+        totals = dict.fromkeys(self.averages, 0.0)
+        for key, start, end in spans:
+            totals[key] += end - start
+        keep = self.smoothing
+        for key, total in totals.items():
+            self.averages[key] = self.averages[key] * keep + total * 1000 * (1 - keep)
+        self.frame_ms = self.frame_ms * keep + (now - self.frame_start) * 1000 * (1 - keep)
+        self.frame_start = now
+
+    def toggle_hud(self):
+        self.hud = not self.hud
+
+    def draw_hud(self, surface):
+        if not self.hud:
+            return
+        import pygame
+
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        rows = [('frame', self.frame_ms, 0)]
+        rows += [(key.rsplit('/', 1)[-1], ms, self.depths[key] + 1) for key, ms in self.averages.items()]
+        line, width = 15, 230
+        panel = pygame.Surface((width, line * len(rows) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for row, (name, ms, depth) in enumerate(rows):
+            y = 4 + row * line
+            share = min(1.0, ms / self.budget_ms)
+            color = (220, 90, 80) if row == 0 and ms > self.budget_ms else (90, 160, 220)
+            pygame.draw.rect(panel, color, (150, y + 3, int(72 * share), line - 6))
+            text = self.font.render(f"{'  ' * depth}{name}", True, (220, 220, 220))
+            panel.blit(text, (6, y))
+            text = self.font.render(f'{ms:5.2f}', True, (220, 220, 220))
+            panel.blit(text, (146 - text.get_width(), y))
+        surface.blit(panel, (8, 8))
+
+    def export(self, path):
+        """Write the kept frames as Chrome trace events (times in microseconds)."""
+        pid = os.getpid()
+        origin = self.frames[0][0] if self.frames else 0.0
+        events = []
+        for index, (start, end, spans) in enumerate(self.frames):
+            events.append({'name': 'frame', 'ph': 'X', 'pid': pid, 'tid': 0, 'args': {'frame': index},
+                           'ts': (start - origin) * 1e6, 'dur': (end - start) * 1e6})
+            for key, span_start, span_end in spans:
+                events.append({'name': key.rsplit('/', 1)[-1], 'cat': key.split('/', 1)[0], 'ph': 'X',
+                               'pid': pid, 'tid': 0, 'args': {'span': key},
+                               'ts': (span_start - origin) * 1e6, 'dur': (span_end - span_start) * 1e6})
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def close(self):
+        if self.trace is not None and self.frames:
+            self.export(self.trace)
+            self.frames.clear()